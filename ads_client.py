@@ -4,16 +4,39 @@ Handles connection, symbol reading/writing, and symbol discovery
 """
 
 import pyads
+from pyads.constants import ADST_STRING, ADST_WSTRING
+from pyads.errorcodes import ERROR_CODES
 import logging
-from typing import Dict, List, Optional, Any
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Callable, Tuple
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# pyads sum reads report per-symbol failures as the ADS error text instead of a value
+_ADS_ERROR_TEXTS = frozenset(ERROR_CODES.values())
+_ADS_NO_ERROR = ERROR_CODES[0]
+
+# ADS data types whose values are text, so an error text may be a real value
+_ADS_STRING_TYPES = frozenset((ADST_STRING, ADST_WSTRING))
+
+# TwinCAT attributes in comments: {attribute 'Key' := 'Value'}
+_ATTRIBUTE_PATTERN = re.compile(r"\{attribute\s+'([^']+)'\s*:=\s*'([^']+)'\}")
+
+
+@lru_cache(maxsize=8)
+def _compile_search_patterns(patterns: Tuple[str, ...]):
+    """Compile discovery search patterns into one regex matching any of them"""
+    return re.compile('|'.join(re.escape(pattern) for pattern in patterns))
+
 
 class ADSClient:
     """ADS Client for TwinCAT 3 communication"""
     
+    # Symbols per ADS sum write unless config sets 'ads.write_batch_size'
+    DEFAULT_WRITE_BATCH_SIZE = 64
+    
     def __init__(self, ams_net_id: str, ams_port: int):
         """
         Initialize ADS client
@@ -24,9 +47,14 @@ class ADSClient:
         """
         self.ams_net_id = ams_net_id
         self.ams_port = ams_port
+        # pyads Connection: opened once in connect() and shared by every read,
+        # write and notification until disconnect(), never reopened per request
         self.plc = None
         self.connected = False
         self.symbol_info_cache = {}
+        self._notification_symbols = []  # AdsSymbol objects with active notifications
+        self._handles = {}  # symbol_name: PLC variable handle, released on disconnect
+        self._handles_lock = threading.Lock()  # Used from the GUI and the ADS worker thread
         
     def connect(self) -> bool:
         """
@@ -39,22 +67,24 @@ class ADSClient:
             self.plc = pyads.Connection(self.ams_net_id, self.ams_port)
             self.plc.open()
             self.connected = True
-            logger.info(f"Connected to PLC: {self.ams_net_id}:{self.ams_port}")
+            logger.info("Connected to PLC: %s:%s", self.ams_net_id, self.ams_port)
             return True
         except Exception as e:
-            logger.error(f"Failed to connect to PLC: {e}")
+            logger.error("Failed to connect to PLC: %s", e)
             self.connected = False
             return False
     
     def disconnect(self):
         """Disconnect from TwinCAT PLC"""
         if self.plc and self.connected:
+            self.clear_notifications()
+            self._release_handles()
             try:
                 self.plc.close()
                 self.connected = False
                 logger.info("Disconnected from PLC")
             except Exception as e:
-                logger.error(f"Error during disconnect: {e}")
+                logger.error("Error during disconnect: %s", e)
     
     def read_symbol(self, symbol_name: str) -> Optional[Any]:
         """
@@ -71,10 +101,11 @@ class ADSClient:
             return None
         
         try:
-            value = self.plc.read_by_name(symbol_name)
+            value = self.plc.read_by_name(symbol_name, handle=self.get_handle(symbol_name))
             return value
         except Exception as e:
-            logger.error(f"Failed to read symbol '{symbol_name}': {e}")
+            logger.error("Failed to read symbol '%s': %s", symbol_name, e)
+            self.drop_handle(symbol_name)
             return None
     
     def write_symbol(self, symbol_name: str, value: Any) -> bool:
@@ -93,23 +124,138 @@ class ADSClient:
             return False
         
         try:
-            self.plc.write_by_name(symbol_name, value)
-            logger.debug(f"Written {value} to '{symbol_name}'")
+            self.plc.write_by_name(symbol_name, value, handle=self.get_handle(symbol_name))
+            logger.debug("Written %s to '%s'", value, symbol_name)
             return True
         except Exception as e:
-            logger.error(f"Failed to write to symbol '{symbol_name}': {e}")
+            logger.error("Failed to write to symbol '%s': %s", symbol_name, e)
+            self.drop_handle(symbol_name)
             return False
     
+    def get_handle(self, symbol_name: str) -> int:
+        """
+        Get the PLC variable handle for a symbol, acquiring it on first use
+        
+        Without a handle, pyads acquires and releases one around every single
+        read/write, i.e. three ADS requests instead of one.
+        """
+        with self._handles_lock:
+            handle = self._handles.get(symbol_name)
+            if handle is None:
+                handle = self.plc.get_handle(symbol_name)
+                self._handles[symbol_name] = handle
+        return handle
+    
+    def drop_handle(self, symbol_name: str):
+        """Forget a handle that may have become invalid (e.g. after an online change)"""
+        with self._handles_lock:
+            handle = self._handles.pop(symbol_name, None)
+        if handle is not None:
+            self._release_handle(handle)
+    
+    def _release_handles(self):
+        """Release all cached PLC variable handles"""
+        with self._handles_lock:
+            handles, self._handles = self._handles, {}
+        for handle in handles.values():
+            self._release_handle(handle)
+    
+    def _release_handle(self, handle: int):
+        """Release a PLC variable handle, ignoring errors"""
+        try:
+            self.plc.release_handle(handle)
+        except Exception:
+            pass
+    
     def read_multiple_symbols(self, symbol_names: List[str]) -> Dict[str, Any]:
         """
         Read multiple symbols at once
         
+        Uses a single ADS sum read (ADSIGRP_SUMUP_READ) for all symbols; pyads
+        caches the symbol info, so later reads don't resolve names again.
+        Falls back to reading one symbol at a time if the sum read fails
+        (e.g. one of the names doesn't exist in the PLC).
+        
         Args:
             symbol_names: List of symbol names
             
         Returns:
-            Dictionary with symbol_name: value pairs
+            Dictionary with symbol_name: value pairs (failed reads are left out)
         """
+        if not self.connected:
+            logger.warning("Not connected to PLC")
+            return {}
+        
+        if not symbol_names:
+            return {}
+        
+        try:
+            values = self.plc.read_list_by_name(list(symbol_names))
+        except Exception as e:
+            logger.debug("Sum read failed, reading symbols one by one: %s", e)
+            return self._read_symbols_individually(symbol_names)
+        
+        # Filled by read_list_by_name; tells STRING symbols from failed reads
+        symbol_info = getattr(self.plc, '_symbol_info_cache', {})
+        
+        results = {}
+        for symbol_name, value in values.items():
+            if value is None or (isinstance(value, str) and value in _ADS_ERROR_TEXTS
+                                 and not self._is_string_symbol(symbol_info.get(symbol_name))):
+                logger.error("Failed to read symbol '%s': %s", symbol_name, value)
+                continue
+            results[symbol_name] = value
+        return results
+    
+    @staticmethod
+    def _is_string_symbol(info) -> bool:
+        """Check if cached pyads symbol info (SAdsSymbolEntry) is a STRING or WSTRING"""
+        return info is not None and info.dataType in _ADS_STRING_TYPES
+    
+    def write_multiple_symbols(self, values: Dict[str, Any],
+                               batch_size: int = DEFAULT_WRITE_BATCH_SIZE) -> Dict[str, bool]:
+        """
+        Write multiple symbols at once
+        
+        Uses ADS sum writes (ADSIGRP_SUMUP_WRITE) with at most batch_size
+        symbols per request. Falls back to writing one symbol at a time if
+        the sum write fails.
+        
+        Args:
+            values: Dictionary of symbol_name: value pairs
+            batch_size: Maximum number of symbols per ADS request
+            
+        Returns:
+            Dictionary with symbol_name: success pairs
+        """
+        if not self.connected:
+            logger.warning("Not connected to PLC")
+            return {symbol_name: False for symbol_name in values}
+        
+        if not values:
+            return {}
+        
+        try:
+            errors = self.plc.write_list_by_name(dict(values), ads_sub_commands=batch_size)
+        except Exception as e:
+            logger.debug("Sum write failed, writing symbols one by one: %s", e)
+            return {
+                symbol_name: self.write_symbol(symbol_name, value)
+                for symbol_name, value in values.items()
+            }
+        
+        results = {}
+        for symbol_name, error in errors.items():
+            success = error == _ADS_NO_ERROR
+            if success:
+                logger.debug("Written %s to '%s'", values[symbol_name], symbol_name)
+            else:
+                logger.error("Failed to write to symbol '%s': %s", symbol_name, error)
+            results[symbol_name] = success
+        return results
+    
+    def _read_symbols_individually(self, symbol_names: List[str]) -> Dict[str, Any]:
+        """Read symbols with one ADS request each"""
         results = {}
         for symbol_name in symbol_names:
             value = self.read_symbol(symbol_name)
@@ -117,6 +263,52 @@ class ADSClient:
                 results[symbol_name] = value
         return results
     
+    def add_notification(self, symbol_name: str, callback: Callable[[str, Any], None]) -> bool:
+        """
+        Subscribe to on-change device notifications for a symbol
+        
+        The callback is invoked from the ADS router thread, not the Qt thread,
+        so GUI code should marshal it through a queued signal.
+        
+        Args:
+            symbol_name: Full symbol name
+            callback: Function called as callback(symbol_name, value)
+            
+        Returns:
+            True if the notification was registered, False otherwise
+        """
+        if not self.connected:
+            logger.warning("Not connected to PLC")
+            return False
+        
+        try:
+            symbol = self.plc.get_symbol(symbol_name)
+            plc_type = symbol.plc_type
+            if plc_type is None:
+                raise ValueError(f"unsupported data type '{symbol.symbol_type}'")
+            
+            def on_change(notification, _data):
+                _, _, value = self.plc.parse_notification(notification, plc_type)
+                callback(symbol_name, value)
+            
+            # Notification length is taken from the symbol's data type
+            symbol.add_device_notification(on_change)
+        except Exception as e:
+            logger.warning("Failed to add notification for '%s': %s", symbol_name, e)
+            return False
+        
+        self._notification_symbols.append(symbol)
+        return True
+    
+    def clear_notifications(self):
+        """Delete all device notifications added with add_notification"""
+        for symbol in self._notification_symbols:
+            try:
+                symbol.clear_device_notifications()
+            except Exception as e:
+                logger.warning("Failed to delete notification for '%s': %s", symbol.name, e)
+        self._notification_symbols = []
+    
     def get_symbol_info(self, symbol_name: str) -> Optional[Dict]:
         """
         Get detailed information about a symbol including attributes
@@ -138,11 +330,12 @@ class ADSClient:
             # Get symbol handle
             symbol_info = self.plc.get_symbol(symbol_name)
             
+            comment = getattr(symbol_info, 'comment', '')
             info = {
                 'name': symbol_name,
                 'data_type': symbol_info.plc_type,
-                'comment': symbol_info.comment if hasattr(symbol_info, 'comment') else '',
-                'attributes': self._parse_attributes(symbol_info.comment) if hasattr(symbol_info, 'comment') else {}
+                'comment': comment,
+                'attributes': self._parse_attributes(comment)
             }
             
             # Cache the result
@@ -150,7 +343,7 @@ class ADSClient:
             return info
             
         except Exception as e:
-            logger.error(f"Failed to get symbol info for '{symbol_name}': {e}")
+            logger.error("Failed to get symbol info for '%s': %s", symbol_name, e)
             return None
     
     def _parse_attributes(self, comment: str) -> Dict[str, str]:
@@ -163,20 +356,12 @@ class ADSClient:
         Returns:
             Dictionary of attribute key-value pairs
         """
-        attributes = {}
         if not comment:
-            return attributes
+            return {}
         
         # TwinCAT attributes are typically in format:
         # {attribute 'Key' := 'Value'}
-        import re
-        pattern = r"\{attribute\s+'([^']+)'\s*:=\s*'([^']+)'\}"
-        matches = re.findall(pattern, comment)
-        
-        for key, value in matches:
-            attributes[key] = value
-        
-        return attributes
+        return dict(_ATTRIBUTE_PATTERN.findall(comment))
     
     def discover_symbols(self, patterns: List[str] = None) -> Dict[str, Dict]:
         """
@@ -194,81 +379,62 @@ class ADSClient:
         
         discovered_symbols = {}
         
+        # Attribute keys and values are parsed from the comment, so a pattern
+        # found in either is also found in the comment text - one search covers all
+        search = _compile_search_patterns(tuple(patterns)).search if patterns else None
+        
         try:
             # Get all symbols from PLC
             symbols = self.plc.get_all_symbols()
-            logger.info(f"Found {len(symbols)} total symbols in PLC")
+            logger.info("Found %d total symbols in PLC", len(symbols))
             
             for symbol in symbols:
                 symbol_name = symbol.name
                 
                 try:
                     # Build info dict directly from symbol object
+                    comment = getattr(symbol, 'comment', None) or ''
                     info = {
                         'name': symbol_name,
-                        'data_type': str(symbol.plc_type) if hasattr(symbol, 'plc_type') else 'UNKNOWN',
-                        'comment': '',
-                        'attributes': {}
+                        'data_type': str(getattr(symbol, 'plc_type', 'UNKNOWN')),
+                        'comment': comment,
+                        'attributes': self._parse_attributes(comment)
                     }
                     
-                    # Try to get comment
-                    if hasattr(symbol, 'comment'):
-                        info['comment'] = symbol.comment or ''
-                        info['attributes'] = self._parse_attributes(info['comment'])
-                    
                     # Debug: Log first few symbols
                     if len(discovered_symbols) < 3:
-                        logger.debug(f"Symbol: {symbol_name}, Type: {info['data_type']}, Comment: {info['comment'][:100] if info['comment'] else 'None'}")
+                        logger.debug("Symbol: %s, Type: %s, Comment: %s", symbol_name,
+                                     info['data_type'], comment[:100] if comment else 'None')
                     
-                    # If patterns specified, filter by attributes OR by symbol name
-                    if patterns:
-                        attributes = info.get('attributes', {})
-                        
-                        # Check attributes
-                        found = False
-                        for pattern in patterns:
-                            # Check in attribute values
-                            if any(pattern in str(attr_value) for attr_value in attributes.values()):
-                                discovered_symbols[symbol_name] = info
-                                found = True
-                                break
-                            # Check in attribute keys
-                            if pattern in attributes:
-                                discovered_symbols[symbol_name] = info
-                                found = True
-                                break
-                            # Check in comment text directly (fallback)
-                            if pattern in info.get('comment', ''):
-                                discovered_symbols[symbol_name] = info
-                                found = True
-                                break
-                        
-                        if found:
-                            logger.debug(f"Added symbol: {symbol_name} (matched pattern)")
+                    # If patterns specified, filter by attributes/comment text
+                    if search:
+                        if search(comment):
+                            discovered_symbols[symbol_name] = info
+                            logger.debug("Added symbol: %s (matched pattern)", symbol_name)
                     else:
                         # No filter, add all symbols
                         discovered_symbols[symbol_name] = info
                 
                 except Exception as e:
-                    logger.warning(f"Error processing symbol {symbol_name}: {e}")
+                    logger.warning("Error processing symbol %s: %s", symbol_name, e)
                     continue
             
-            logger.info(f"Discovered {len(discovered_symbols)} symbols matching HMI patterns")
+            logger.info("Discovered %d symbols matching HMI patterns", len(discovered_symbols))
             
             # If no symbols found with patterns, log for debugging
             if len(discovered_symbols) == 0 and len(symbols) > 0:
                 logger.warning("No symbols matched HMI patterns. Try checking a few symbols manually:")
                 for i, symbol in enumerate(symbols[:5]):
                     try:
-                        comment = symbol.comment if hasattr(symbol, 'comment') else 'No comment'
-                        logger.info(f"  Sample {i+1}: {symbol.name} - Comment: {comment[:100] if comment else 'None'}")
-                    except:
+                        comment = getattr(symbol, 'comment', 'No comment')
+                        logger.info("  Sample %d: %s - Comment: %s", i+1, symbol.name, comment[:100] if comment else 'None')
+                    except Exception:
                         pass
             
             return discovered_symbols
             
         except Exception as e:
-            logger.error(f"Failed to discover symbols: {e}", exc_info=True)
+            logger.error("Failed to discover symbols: %s", e, exc_info=True)
             return {}
     
     def get_connection_status(self) -> Dict[str, Any]:
@@ -291,7 +457,7 @@ class ADSClient:
                 status['plc_state'] = device_info.ads_state
                 status['device_state'] = device_info.device_state
             except Exception as e:
-                logger.error(f"Failed to read PLC state: {e}")
+                logger.error("Failed to read PLC state: %s", e)
                 status['error'] = str(e)
         
         return status
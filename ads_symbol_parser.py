@@ -7,7 +7,6 @@ import logging
 import re
 from typing import Dict, List, Optional
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +19,14 @@ class SymbolParser:
     CATEGORY_SWITCH = 'switch'
     CATEGORY_ALARM = 'alarm'
     
+    # Numeric PLC types that can carry alarm limits
+    NUMERIC_TYPES = frozenset({'REAL', 'LREAL', 'INT', 'DINT', 'UINT', 'UDINT'})
+    
+    # Comment attributes: {attribute 'Key' := 'Value'} and tags like {attribute 'HMI_SP'}
+    ATTRIBUTE_PATTERN = re.compile(r"\{attribute\s+'([^']+)'\s*:=\s*'([^']+)'\}")
+    TAG_PATTERN = re.compile(r"\{attribute\s+'([^']+)'\}")
+    CAMEL_CASE_PATTERN = re.compile(r'([a-z])([A-Z])')
+    
     def __init__(self):
         self.symbols = {}
         self.categorized_symbols = {
@@ -28,6 +35,7 @@ class SymbolParser:
             self.CATEGORY_SWITCH: [],
             self.CATEGORY_ALARM: []
         }
+        self._symbols_by_name = {}  # symbol name: parsed symbol, for get_symbol_config
     
     def parse_symbols(self, symbol_dict: Dict[str, Dict]) -> Dict[str, List[Dict]]:
         """
@@ -46,6 +54,7 @@ class SymbolParser:
             self.CATEGORY_SWITCH: [],
             self.CATEGORY_ALARM: []
         }
+        self._symbols_by_name = {}
         
         for symbol_name, symbol_info in symbol_dict.items():
             parsed_symbol = self._parse_single_symbol(symbol_name, symbol_info)
@@ -53,6 +62,7 @@ class SymbolParser:
             if parsed_symbol:
                 category = parsed_symbol['category']
                 self.categorized_symbols[category].append(parsed_symbol)
+                self._symbols_by_name.setdefault(parsed_symbol['name'], parsed_symbol)
         
         logger.info(f"Parsed symbols: "
                    f"SP={len(self.categorized_symbols[self.CATEGORY_SETPOINT])}, "
@@ -107,7 +117,7 @@ class SymbolParser:
             parsed.update(self._parse_alarm_attributes(attributes))
         
         # Parse alarm limits (can be on any numeric symbol)
-        if data_type in ['REAL', 'LREAL', 'INT', 'DINT', 'UINT', 'UDINT']:
+        if data_type in self.NUMERIC_TYPES:
             parsed['alarm_config'] = self._parse_alarm_limits(attributes)
         
         return parsed
@@ -125,17 +135,11 @@ class SymbolParser:
         attributes = {}
         
         # Pattern: {attribute 'Key' := 'Value'}
-        pattern = r"\{attribute\s+'([^']+)'\s*:=\s*'([^']+)'\}"
-        matches = re.findall(pattern, comment)
-        
-        for key, value in matches:
+        for key, value in self.ATTRIBUTE_PATTERN.findall(comment):
             attributes[key] = value
         
         # Also check for patterns without quotes (for HMI_ tags)
-        pattern2 = r"\{attribute\s+'([^']+)'\}"
-        matches2 = re.findall(pattern2, comment)
-        
-        for match in matches2:
+        for match in self.TAG_PATTERN.findall(comment):
             # If it's a tag like HMI_SP, store as boolean
             attributes[match] = 'true'
         
@@ -201,8 +205,9 @@ class SymbolParser:
                 except ValueError:
                     continue
         
+        # Widgets expect a tuple of (position, label) pairs sorted by position
         config = {
-            'positions': positions
+            'positions': tuple(sorted(positions.items()))
         }
         return config
     
@@ -276,7 +281,7 @@ class SymbolParser:
         name = symbol_name.split('.')[-1]
         
         # Insert spaces before capitals
-        name = re.sub(r'([a-z])([A-Z])', r'\1 \2', name)
+        name = self.CAMEL_CASE_PATTERN.sub(r'\1 \2', name)
         
         # Replace underscores with spaces
         name = name.replace('_', ' ')
@@ -305,11 +310,7 @@ class SymbolParser:
         Returns:
             Symbol configuration or None
         """
-        for category_symbols in self.categorized_symbols.values():
-            for symbol in category_symbols:
-                if symbol['name'] == symbol_name:
-                    return symbol
-        return None
+        return self._symbols_by_name.get(symbol_name)
     
     def get_symbols_with_alarms(self) -> List[Dict]:
         """
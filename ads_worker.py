@@ -0,0 +1,166 @@
+"""
+ADS Worker for TwinCAT HMI
+Runs blocking ADS reads and writes on a background QThread
+"""
+
+import logging
+from typing import Optional
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+from ads_client import ADSClient
+
+logger = logging.getLogger(__name__)
+
+
+class ADSWorker(QObject):
+    """
+    Performs ADS I/O for the main window on a worker thread
+
+    Move the worker to a QThread and call its slots through queued signals;
+    results come back as signals, so the GUI thread never waits on the PLC.
+    Periodic reads are driven by a timer owned by the worker thread.
+    """
+
+    values_ready = pyqtSignal(dict)          # symbol_name: value
+    read_failed = pyqtSignal(str)            # error message
+    write_done = pyqtSignal(str, object, bool)  # symbol_name, value, success
+    scan_finished = pyqtSignal(object, int)  # generated config dict (or None), generation
+
+    def __init__(self):
+        super().__init__()
+        self.ads_client: Optional[ADSClient] = None
+
+        # Client methods bound once in set_client, not per poll tick
+        self._read = None
+        self._write = None
+
+        # Created in start_polling so the timer lives on the worker thread
+        self._poll_timer: Optional[QTimer] = None
+        self._poll_names = ()
+
+    def set_client(self, ads_client: Optional[ADSClient]):
+        """
+        Set the ADS client used for reads and writes
+
+        Args:
+            ads_client: Connected ADS client, or None after disconnect
+        """
+        self.ads_client = ads_client
+        if ads_client is None:
+            self._read = self._write = None
+        else:
+            self._read = ads_client.read_multiple_symbols
+            self._write = ads_client.write_multiple_symbols
+
+    @pyqtSlot(object, int)
+    def start_polling(self, symbol_names, interval_ms: int):
+        """
+        Read symbol_names every interval_ms and emit values_ready each time
+
+        Args:
+            symbol_names: Sequence of symbol names to read
+            interval_ms: Poll interval in milliseconds
+        """
+        if self._poll_timer is None:
+            self._poll_timer = QTimer(self)
+            self._poll_timer.timeout.connect(self._poll)
+
+        self._poll_names = tuple(symbol_names)
+        self._poll_timer.start(interval_ms)
+
+    @pyqtSlot()
+    def stop_polling(self):
+        """Stop periodic reads"""
+        if self._poll_timer is not None:
+            self._poll_timer.stop()
+        self._poll_names = ()
+
+    @pyqtSlot()
+    def _poll(self):
+        """Poll timer tick"""
+        names = self._poll_names
+        if names:
+            self.do_read(names)
+
+    @pyqtSlot()
+    def do_disconnect(self):
+        """
+        Stop polling and close the ADS connection
+
+        Runs on the worker thread after any read, write or scan in progress,
+        so the port is never closed under a running ADS call. Invoke it with
+        a blocking queued connection to wait until the port is closed.
+        """
+        self.stop_polling()
+        ads_client = self.ads_client
+        self.set_client(None)
+        if ads_client is not None:
+            ads_client.disconnect()
+
+    @pyqtSlot(object)
+    def do_read(self, symbol_names):
+        """
+        Read symbols and emit values_ready (or read_failed)
+
+        Args:
+            symbol_names: Sequence of symbol names to read
+        """
+        read = self._read
+        if read is None:
+            self.values_ready.emit({})
+            return
+
+        try:
+            values = read(symbol_names)
+        except Exception as e:
+            logger.error("Read error: %s", e)
+            self.read_failed.emit(str(e))
+            return
+
+        self.values_ready.emit(values)
+
+    @pyqtSlot(dict, int)
+    def do_write(self, values: dict, batch_size: int):
+        """
+        Write symbol values in one sum write and emit write_done per symbol
+
+        Args:
+            values: Dictionary of symbol_name: value pairs
+            batch_size: Maximum number of symbols per ADS request
+        """
+        write = self._write
+        if write is None:
+            results = dict.fromkeys(values, False)
+        else:
+            results = write(values, batch_size)
+
+        for symbol_name, value in values.items():
+            self.write_done.emit(symbol_name, value, results.get(symbol_name, False))
+
+    @pyqtSlot(int)
+    def do_scan(self, generation: int):
+        """
+        Scan all PLC symbols, write config.json and emit scan_finished
+
+        Runs on the worker thread, so scanning a large PLC doesn't block the
+        UI and never overlaps a read or write on the same connection.
+
+        Args:
+            generation: Connection generation, passed back with the result so
+                results from an earlier connection can be dropped
+        """
+        ads_client = self.ads_client
+        if ads_client is None:
+            self.scan_finished.emit(None, generation)
+            return
+
+        try:
+            # Imported on first scan
+            from symbol_auto_config import SymbolAutoConfig
+            new_config = SymbolAutoConfig(ads_client).scan_and_generate_config()
+        except Exception as e:
+            logger.error("PLC scan error: %s", e, exc_info=True)
+            new_config = None
+
+        self.scan_finished.emit(new_config, generation)
@@ -5,14 +5,53 @@ Displays active alarms with color coding and acknowledgment buttons
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QLabel, QScrollArea, QFrame, QGroupBox)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
-from PyQt5.QtGui import QFont, QPalette, QColor
+from PyQt5.QtCore import Qt, QRect, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont, QPalette, QColor, QFontMetrics, QPainter, QPixmap
+from functools import lru_cache
 import logging
+import math
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _icon_pixmap(icon: str, color: str, pixel_ratio: float) -> QPixmap:
+    """
+    Render a priority icon glyph to a pixmap once
+    
+    Emoji go through the colour-font fallback when shaped, which is slow;
+    alarm widgets are rebuilt on every alarm change, so they reuse these.
+    
+    Args:
+        icon: Icon text (emoji)
+        color: Text color for non-colour glyphs
+        pixel_ratio: Device pixel ratio of the widget showing the icon
+        
+    Returns:
+        Transparent pixmap with the icon drawn centered
+    """
+    font = QFont('Segoe UI', 14)
+    metrics = QFontMetrics(font)
+    bounds = metrics.boundingRect(icon)
+    
+    # Wide glyphs (emoji with variation selectors) are wider than the line height
+    width = max(metrics.horizontalAdvance(icon), bounds.width(), metrics.height())
+    height = max(bounds.height(), metrics.height())
+    
+    # Rendered at device resolution so the icon stays sharp on HiDPI screens
+    pixmap = QPixmap(math.ceil(width * pixel_ratio), math.ceil(height * pixel_ratio))
+    pixmap.setDevicePixelRatio(pixel_ratio)
+    pixmap.fill(Qt.transparent)
+    
+    painter = QPainter(pixmap)
+    painter.setFont(font)
+    painter.setPen(QColor(color))
+    painter.drawText(QRect(0, 0, width, height), Qt.AlignCenter, icon)
+    painter.end()
+    
+    return pixmap
+
+
 class AlarmWidget(QFrame):
     """Individual alarm display widget"""
     
@@ -45,7 +84,6 @@ class AlarmWidget(QFrame):
         
         # Priority icon
         self.icon_label = QLabel()
-        self.icon_label.setFont(QFont('Segoe UI', 14))
         layout.addWidget(self.icon_label)
         
         # Alarm message
@@ -79,7 +117,8 @@ class AlarmWidget(QFrame):
                                          self.PRIORITY_COLORS[2])
         
         # Set icon
-        self.icon_label.setText(colors['icon'])
+        self.icon_label.setPixmap(_icon_pixmap(colors['icon'], colors['fg'],
+                                               self.devicePixelRatioF()))
         
         # Set message
         self.message_label.setText(self.alarm.message)
@@ -114,7 +153,6 @@ class AlarmWidget(QFrame):
         
         self.message_label.setStyleSheet(f"color: {fg_color};")
         self.time_label.setStyleSheet(f"color: {fg_color};")
-        self.icon_label.setStyleSheet(f"color: {fg_color};")
     
     def set_blink(self, blink: bool):
         """Set blinking state"""
@@ -12,7 +12,6 @@ from PyQt5.QtGui import QFont, QColor
 from datetime import datetime, timedelta
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
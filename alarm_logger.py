@@ -10,7 +10,6 @@ from datetime import datetime
 from pathlib import Path
 from typing import List
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -8,7 +8,6 @@ from datetime import datetime
 from typing import Dict, List, Optional, Callable
 from enum import Enum
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -107,8 +106,65 @@ class AlarmManager:
         # Track alarm states for hysteresis
         self.alarm_states: Dict[str, bool] = {}
         
+        # Number of active alarms per symbol, kept in step with active_alarms
+        self._active_symbol_counts: Dict[str, int] = {}
+        
+        # Incremented whenever an alarm is activated or cleared, so callers can
+        # tell that active_symbol_names is unchanged without comparing sets
+        self.revision = 0
+        
+        # symbol_configs list last passed to check_alarms, indexed by symbol name
+        self._indexed_configs: Optional[List[Dict]] = None
+        self._indexed_count = 0
+        self._configs_by_name: Dict[str, List[Dict]] = {}
+        
         logger.info(f"AlarmManager initialized (enabled={self.alarms_enabled})")
     
+    @property
+    def active_symbol_names(self):
+        """Live, read-only view of the names of symbols with an active alarm"""
+        return self._active_symbol_counts.keys()
+    
+    def _activate(self, alarm_key: str, alarm: Alarm):
+        """Add a new alarm to the active alarms and history"""
+        self.active_alarms[alarm_key] = alarm
+        self.alarm_history.append(alarm)
+        
+        counts = self._active_symbol_counts
+        counts[alarm.symbol_name] = counts.get(alarm.symbol_name, 0) + 1
+        self.revision += 1
+    
+    def _deactivate(self, alarm_key: str) -> Alarm:
+        """Clear an active alarm and remove it from the active alarms"""
+        alarm = self.active_alarms.pop(alarm_key)
+        alarm.clear()
+        
+        counts = self._active_symbol_counts
+        remaining = counts[alarm.symbol_name] - 1
+        if remaining:
+            counts[alarm.symbol_name] = remaining
+        else:
+            del counts[alarm.symbol_name]
+        self.revision += 1
+        return alarm
+    
+    def _index_configs(self, symbol_configs: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        Get symbol_configs grouped by symbol name
+        
+        The index is rebuilt only when a different (or resized) config list
+        is passed, i.e. after symbols were (re)discovered.
+        """
+        if (symbol_configs is not self._indexed_configs or
+                len(symbol_configs) != self._indexed_count):
+            index: Dict[str, List[Dict]] = {}
+            for symbol_config in symbol_configs:
+                index.setdefault(symbol_config['name'], []).append(symbol_config)
+            self._configs_by_name = index
+            self._indexed_configs = symbol_configs
+            self._indexed_count = len(symbol_configs)
+        return self._configs_by_name
+    
     def register_callback(self, callback: Callable):
         """
         Register callback function to be called when alarms change
@@ -129,25 +185,21 @@ class AlarmManager:
         if not self.alarms_enabled:
             return
         
-        # Check each symbol that has alarm configuration
-        for symbol_config in symbol_configs:
-            symbol_name = symbol_config['name']
-            
-            # Skip if no current value
-            if symbol_name not in symbol_values:
-                continue
-            
-            current_value = symbol_values[symbol_name]
-            
-            # Check for analog alarms
-            if 'alarm_config' in symbol_config:
-                alarm_config = symbol_config['alarm_config']
-                if alarm_config.get('enabled', False):
-                    self._check_analog_alarms(symbol_name, current_value, alarm_config, symbol_config)
-            
-            # Check for digital alarms
-            if symbol_config.get('category') == 'alarm':
-                self._check_digital_alarm(symbol_name, current_value, symbol_config)
+        # Values usually hold only the changed symbols, so look up their
+        # configs instead of walking every configured symbol
+        configs_by_name = self._index_configs(symbol_configs)
+        
+        for symbol_name, current_value in symbol_values.items():
+            for symbol_config in configs_by_name.get(symbol_name, ()):
+                # Check for analog alarms
+                if 'alarm_config' in symbol_config:
+                    alarm_config = symbol_config['alarm_config']
+                    if alarm_config.get('enabled', False):
+                        self._check_analog_alarms(symbol_name, current_value, alarm_config, symbol_config)
+                
+                # Check for digital alarms
+                if symbol_config.get('category') == 'alarm':
+                    self._check_digital_alarm(symbol_name, current_value, symbol_config)
     
     def _check_analog_alarms(self, symbol_name: str, value: float, 
                             alarm_config: Dict, symbol_config: Dict):
@@ -217,8 +269,7 @@ class AlarmManager:
             # New alarm
             message = f"{symbol_name}: {value:.2f}{unit} {operator} {limit}{unit} ({alarm_type.value})"
             alarm = Alarm(symbol_name, alarm_type, priority, value, limit, message)
-            self.active_alarms[alarm_key] = alarm
-            self.alarm_history.append(alarm)
+            self._activate(alarm_key, alarm)
             logger.warning(f"NEW ALARM: {message}")
             self._trigger_callbacks()
             
@@ -228,8 +279,7 @@ class AlarmManager:
         elif clear_condition and existing_alarm:
             # Clear alarm (with hysteresis)
             if existing_alarm.is_active():
-                existing_alarm.clear()
-                del self.active_alarms[alarm_key]
+                self._deactivate(alarm_key)
                 logger.info(f"Alarm cleared: {existing_alarm.message}")
                 self._trigger_callbacks()
         
@@ -257,8 +307,7 @@ class AlarmManager:
             message = alarm_text
             alarm = Alarm(symbol_name, AlarmType.DIGITAL, priority, 
                          1.0, 1.0, message)
-            self.active_alarms[alarm_key] = alarm
-            self.alarm_history.append(alarm)
+            self._activate(alarm_key, alarm)
             logger.warning(f"NEW DIGITAL ALARM: {message}")
             self._trigger_callbacks()
             
@@ -268,8 +317,7 @@ class AlarmManager:
         elif not value and existing_alarm:
             # Alarm cleared
             if existing_alarm.is_active():
-                existing_alarm.clear()
-                del self.active_alarms[alarm_key]
+                self._deactivate(alarm_key)
                 logger.info(f"Digital alarm cleared: {existing_alarm.message}")
                 self._trigger_callbacks()
     
@@ -5,7 +5,7 @@ import pyads
 import json
 
 # Load config
-with open('config.json', 'r') as f:
+with open('config.json', 'r', encoding='utf-8') as f:
     config = json.load(f)
 
 ams_net_id = config['plc']['ams_net_id']
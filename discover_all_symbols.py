@@ -5,7 +5,7 @@ import pyads
 import json
 
 # Load config
-with open('config.json', 'r') as f:
+with open('config.json', 'r', encoding='utf-8') as f:
     config = json.load(f)
 
 ams_net_id = config['plc']['ams_net_id']
@@ -64,7 +64,7 @@ for category, symbols in expected.items():
                 plc.release_handle(h2)
                 print(f"  ✓ {sym_name} (complete STRUCT)")
                 found[category].append(sym_name)
-            except:
+            except Exception:
                 print(f"  ⚠ {sym_name} (exists but incomplete)")
                 
         except Exception as e:
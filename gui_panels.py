@@ -6,14 +6,70 @@ Setpoint, Switch, and Process Value widgets
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QLineEdit, QSpinBox, QDoubleSpinBox, QPushButton,
                              QComboBox, QGroupBox, QGridLayout, QFrame)
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QSignalBlocker, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QFont, QDoubleValidator, QIntValidator
+from functools import lru_cache
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Shared stylesheet for all panel widgets. Set once on a top-level window so
+# Qt parses it a single time; alarm indication is switched via the
+# 'alarmState' dynamic property instead of swapping per-widget stylesheets.
+PANEL_STYLESHEET = """
+    SetpointWidget {
+        background-color: #FFFFFF;
+        border: 2px solid #CCCCCC;
+        border-radius: 5px;
+    }
+    ProcessValueWidget {
+        background-color: #E8F4F8;
+        border: 2px solid #4682B4;
+        border-radius: 5px;
+    }
+    SetpointWidget[alarmState="true"], ProcessValueWidget[alarmState="true"] {
+        background-color: #FFCCCC;
+        border: 3px solid #FF0000;
+    }
+    SwitchWidget {
+        background-color: #FFF8DC;
+        border: 2px solid #DAA520;
+        border-radius: 5px;
+    }
+    QLabel#infoLabel {
+        color: #666666;
+    }
+"""
+
+
+@lru_cache(maxsize=None)
+def panel_font(size: int, bold: bool = False) -> QFont:
+    """
+    Shared panel font (created once per size/weight)
+    
+    Args:
+        size: Point size
+        bold: Bold weight
+        
+    Returns:
+        QFont instance - setFont() copies it, so sharing is safe
+    """
+    return QFont('Segoe UI', size, QFont.Bold if bold else QFont.Normal)
+
+
+# Alarm limit keys and their short labels, in display order
+_LIMIT_LABELS = (('high_high', 'HH'), ('high', 'H'), ('low', 'L'), ('low_low', 'LL'))
+
+
+def _set_alarm_property(widget: QWidget, has_alarm: bool):
+    """Set the alarmState property and re-polish so the stylesheet is re-applied"""
+    widget.setProperty('alarmState', has_alarm)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+
+
 class SetpointWidget(QFrame):
     """Widget for a single setpoint"""
     
@@ -28,33 +84,37 @@ class SetpointWidget(QFrame):
     
     def setup_ui(self):
         """Setup setpoint UI"""
+        config = self.symbol_config
+        min_value = config.get('min', 0)
+        max_value = config.get('max', 100)
+        
         self.setFrameStyle(QFrame.Box | QFrame.Sunken)
         
         layout = QVBoxLayout()
         layout.setContentsMargins(5, 5, 5, 5)
         
         # Label
-        label = QLabel(self.symbol_config['display_name'])
-        label.setFont(QFont('Segoe UI', 10, QFont.Bold))
+        label = QLabel(config['display_name'])
+        label.setFont(panel_font(10, bold=True))
         layout.addWidget(label)
         
         # Value input
         input_layout = QHBoxLayout()
         
         self.spinbox = QDoubleSpinBox()
-        self.spinbox.setMinimum(self.symbol_config.get('min', 0))
-        self.spinbox.setMaximum(self.symbol_config.get('max', 100))
-        self.spinbox.setDecimals(self.symbol_config.get('decimals', 1))
-        self.spinbox.setSingleStep(self.symbol_config.get('step', 1))
+        self.spinbox.setMinimum(min_value)
+        self.spinbox.setMaximum(max_value)
+        self.spinbox.setDecimals(config.get('decimals', 1))
+        self.spinbox.setSingleStep(config.get('step', 1))
         self.spinbox.setMinimumWidth(100)
         self.spinbox.valueChanged.connect(self._on_value_changed)
         input_layout.addWidget(self.spinbox)
         
         # Unit
-        unit = self.symbol_config.get('unit', '')
+        unit = config.get('unit', '')
         if unit:
             unit_label = QLabel(unit)
-            unit_label.setFont(QFont('Segoe UI', 10))
+            unit_label.setFont(panel_font(10))
             input_layout.addWidget(unit_label)
         
         input_layout.addStretch()
@@ -67,28 +127,21 @@ class SetpointWidget(QFrame):
         layout.addLayout(input_layout)
         
         # Info label (range)
-        info_text = f"Range: {self.symbol_config.get('min', 0)} - {self.symbol_config.get('max', 100)}"
+        info_text = f"Range: {min_value} - {max_value}"
         info_label = QLabel(info_text)
-        info_label.setFont(QFont('Segoe UI', 8))
-        info_label.setStyleSheet("color: #666666;")
+        info_label.setObjectName('infoLabel')
+        info_label.setFont(panel_font(8))
         layout.addWidget(info_label)
         
         self.setLayout(layout)
-        
-        # Normal style
-        self.setStyleSheet("""
-            SetpointWidget {
-                background-color: #FFFFFF;
-                border: 2px solid #CCCCCC;
-                border-radius: 5px;
-            }
-        """)
     
+    @pyqtSlot(float)
     def _on_value_changed(self, value):
         """Handle spinbox value change"""
         # Just update the spinbox, don't write yet
         pass
     
+    @pyqtSlot()
     def _on_write_clicked(self):
         """Handle write button click"""
         value = self.spinbox.value()
@@ -96,30 +149,21 @@ class SetpointWidget(QFrame):
     
     def set_value(self, value: float):
         """Update displayed value"""
-        self.spinbox.blockSignals(True)
-        self.spinbox.setValue(value)
-        self.spinbox.blockSignals(False)
+        # Skip the repaint if the spinbox already shows this value
+        if round(value, self.spinbox.decimals()) == self.spinbox.value():
+            return
+        
+        with QSignalBlocker(self.spinbox):
+            self.spinbox.setValue(value)
     
     def set_alarm_state(self, has_alarm: bool):
         """Set alarm indication"""
-        self.has_alarm = has_alarm
+        # Re-polishing is only needed on a state transition
+        if has_alarm == self.has_alarm:
+            return
         
-        if has_alarm:
-            self.setStyleSheet("""
-                SetpointWidget {
-                    background-color: #FFCCCC;
-                    border: 3px solid #FF0000;
-                    border-radius: 5px;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                SetpointWidget {
-                    background-color: #FFFFFF;
-                    border: 2px solid #CCCCCC;
-                    border-radius: 5px;
-                }
-            """)
+        self.has_alarm = has_alarm
+        _set_alarm_property(self, has_alarm)
 
 
 class ProcessValueWidget(QFrame):
@@ -132,6 +176,11 @@ class ProcessValueWidget(QFrame):
         self.symbol_config = symbol_config
         self.has_alarm = False
         
+        # Resolve display format once instead of on every value update
+        self._decimals = symbol_config.get('decimals', 2)
+        self._format_value = symbol_config.get('format', f'{{:.{self._decimals}f}}').format
+        self._last_text = None
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -144,14 +193,14 @@ class ProcessValueWidget(QFrame):
         
         # Label
         label = QLabel(self.symbol_config['display_name'])
-        label.setFont(QFont('Segoe UI', 10, QFont.Bold))
+        label.setFont(panel_font(10, bold=True))
         layout.addWidget(label)
         
         # Value display
         value_layout = QHBoxLayout()
         
         self.value_label = QLabel('---')
-        self.value_label.setFont(QFont('Segoe UI', 16, QFont.Bold))
+        self.value_label.setFont(panel_font(16, bold=True))
         self.value_label.setAlignment(Qt.AlignCenter)
         value_layout.addWidget(self.value_label)
         
@@ -159,7 +208,7 @@ class ProcessValueWidget(QFrame):
         unit = self.symbol_config.get('unit', '')
         if unit:
             unit_label = QLabel(unit)
-            unit_label.setFont(QFont('Segoe UI', 12))
+            unit_label.setFont(panel_font(12))
             value_layout.addWidget(unit_label)
         
         value_layout.addStretch()
@@ -170,66 +219,44 @@ class ProcessValueWidget(QFrame):
         alarm_config = self.symbol_config.get('alarm_config', {})
         if alarm_config.get('enabled', False):
             limits = alarm_config.get('limits', {})
-            info_parts = []
-            
-            if 'high_high' in limits:
-                info_parts.append(f"HH: {limits['high_high']}")
-            if 'high' in limits:
-                info_parts.append(f"H: {limits['high']}")
-            if 'low' in limits:
-                info_parts.append(f"L: {limits['low']}")
-            if 'low_low' in limits:
-                info_parts.append(f"LL: {limits['low_low']}")
+            info_parts = [
+                f"{short}: {limits[key]}"
+                for key, short in _LIMIT_LABELS
+                if key in limits
+            ]
             
             if info_parts:
                 info_label = QLabel(' | '.join(info_parts))
-                info_label.setFont(QFont('Segoe UI', 8))
-                info_label.setStyleSheet("color: #666666;")
+                info_label.setObjectName('infoLabel')
+                info_label.setFont(panel_font(8))
                 layout.addWidget(info_label)
         
         self.setLayout(layout)
         
         # Make clickable for trend
         self.mousePressEvent = lambda e: self.clicked.emit(self.symbol_config['name'])
-        
-        # Normal style
-        self._update_style()
     
     def set_value(self, value: float):
         """Update displayed value"""
-        decimals = self.symbol_config.get('decimals', 2)
-        format_str = self.symbol_config.get('format', f'{{:.{decimals}f}}')
-        
         try:
-            value_str = format_str.format(value)
-        except:
-            value_str = f"{value:.{decimals}f}"
+            value_str = self._format_value(value)
+        except (ValueError, TypeError, IndexError, KeyError):
+            # Invalid 'format' in the symbol config
+            value_str = f"{value:.{self._decimals}f}"
         
-        self.value_label.setText(value_str)
+        # Only relayout the label when the displayed text actually changes
+        if value_str != self._last_text:
+            self.value_label.setText(value_str)
+            self._last_text = value_str
     
     def set_alarm_state(self, has_alarm: bool):
         """Set alarm indication"""
+        # Re-polishing is only needed on a state transition
+        if has_alarm == self.has_alarm:
+            return
+        
         self.has_alarm = has_alarm
-        self._update_style()
-    
-    def _update_style(self):
-        """Update widget style"""
-        if self.has_alarm:
-            self.setStyleSheet("""
-                ProcessValueWidget {
-                    background-color: #FFCCCC;
-                    border: 3px solid #FF0000;
-                    border-radius: 5px;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                ProcessValueWidget {
-                    background-color: #E8F4F8;
-                    border: 2px solid #4682B4;
-                    border-radius: 5px;
-                }
-            """)
+        _set_alarm_property(self, has_alarm)
 
 
 class SwitchWidget(QFrame):
@@ -252,35 +279,28 @@ class SwitchWidget(QFrame):
         
         # Label
         label = QLabel(self.symbol_config['display_name'])
-        label.setFont(QFont('Segoe UI', 10, QFont.Bold))
+        label.setFont(panel_font(10, bold=True))
         layout.addWidget(label)
         
         # Combo box
         self.combo = QComboBox()
-        self.combo.setFont(QFont('Segoe UI', 10))
+        self.combo.setFont(panel_font(10))
+        
+        # Positions arrive as a sorted tuple of (position, label) pairs
+        positions = self.symbol_config.get('positions', ())
         
-        # Add positions
-        positions = self.symbol_config.get('positions', {})
-        # Sort by numeric value to handle both string and int keys
-        sorted_keys = sorted(positions.keys(), key=lambda x: int(x) if isinstance(x, str) else x)
-        for pos_num in sorted_keys:
-            # Convert pos_num to int for storage (handles both string and int keys)
-            pos_int = int(pos_num) if isinstance(pos_num, str) else pos_num
-            self.combo.addItem(positions[pos_num], pos_int)
+        # Insert all labels in one model operation, then attach the position numbers
+        self.combo.addItems([label for _, label in positions])
+        with QSignalBlocker(self.combo.model()):
+            for index, (pos_num, _) in enumerate(positions):
+                self.combo.setItemData(index, pos_num)
         
         self.combo.currentIndexChanged.connect(self._on_selection_changed)
         layout.addWidget(self.combo)
         
         self.setLayout(layout)
-        
-        self.setStyleSheet("""
-            SwitchWidget {
-                background-color: #FFF8DC;
-                border: 2px solid #DAA520;
-                border-radius: 5px;
-            }
-        """)
     
+    @pyqtSlot(int)
     def _on_selection_changed(self, index):
         """Handle selection change"""
         pos_num = self.combo.itemData(index)
@@ -288,37 +308,92 @@ class SwitchWidget(QFrame):
     
     def set_value(self, value: int):
         """Update selected value"""
+        if self.combo.currentData() == value:
+            return
+        
         # Find index for this position value
         for i in range(self.combo.count()):
             if self.combo.itemData(i) == value:
-                self.combo.blockSignals(True)
-                self.combo.setCurrentIndex(i)
-                self.combo.blockSignals(False)
+                with QSignalBlocker(self.combo):
+                    self.combo.setCurrentIndex(i)
                 break
 
 
-class SetpointPanel(QGroupBox):
+class _SymbolPanel(QGroupBox):
+    """
+    Base for the symbol panels
+    
+    Symbol widgets live in an inner container widget so clear() can drop
+    them all by replacing the container instead of removing them one by one.
+    """
+    
+    def __init__(self, title, parent=None):
+        super().__init__(title, parent)
+        self.setFont(panel_font(11, bold=True))
+        
+        self.widgets = {}
+        
+        self._outer_layout = QVBoxLayout()
+        self._outer_layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self._outer_layout)
+        
+        self.container = None
+        self._create_container()
+    
+    def _create_layout(self):
+        """Create the layout for a fresh container (override in subclasses)"""
+        layout = QVBoxLayout()
+        layout.addStretch()
+        return layout
+    
+    def _create_container(self):
+        """Create an empty container and add it to the panel"""
+        self.container = QWidget()
+        self.layout = self._create_layout()
+        self.container.setLayout(self.layout)
+        self._outer_layout.addWidget(self.container)
+    
+    def clear(self):
+        """Remove all symbol widgets from the panel"""
+        old_container = self.container
+        self._outer_layout.removeWidget(old_container)
+        old_container.hide()
+        old_container.deleteLater()
+        
+        self.widgets.clear()
+        self._create_container()
+
+
+class SetpointPanel(_SymbolPanel):
     """Panel containing all setpoints"""
     
     value_changed = pyqtSignal(str, float)
     
     def __init__(self, parent=None):
         super().__init__("Setpunkter", parent)
-        self.setFont(QFont('Segoe UI', 11, QFont.Bold))
-        
-        self.widgets = {}
-        self.layout = QVBoxLayout()
-        self.layout.addStretch()
-        self.setLayout(self.layout)
     
     def add_setpoint(self, symbol_config):
         """Add a setpoint widget"""
-        widget = SetpointWidget(symbol_config)
-        widget.value_changed.connect(self.value_changed.emit)
+        self.add_setpoints((symbol_config,))
+    
+    def add_setpoints(self, symbol_configs):
+        """
+        Add several setpoint widgets with repaints suspended (prefer for bulk loads)
         
-        # Insert before stretch
-        self.layout.insertWidget(self.layout.count() - 1, widget)
-        self.widgets[symbol_config['name']] = widget
+        Args:
+            symbol_configs: Iterable of setpoint symbol configurations
+        """
+        self.setUpdatesEnabled(False)
+        try:
+            for symbol_config in symbol_configs:
+                widget = SetpointWidget(symbol_config)
+                widget.value_changed.connect(self.value_changed)
+                
+                # Insert before stretch
+                self.layout.insertWidget(self.layout.count() - 1, widget)
+                self.widgets[symbol_config['name']] = widget
+        finally:
+            self.setUpdatesEnabled(True)
     
     def update_value(self, symbol_name: str, value: float):
         """Update setpoint value"""
@@ -331,36 +406,48 @@ class SetpointPanel(QGroupBox):
             self.widgets[symbol_name].set_alarm_state(has_alarm)
 
 
-class ProcessValuePanel(QGroupBox):
+class ProcessValuePanel(_SymbolPanel):
     """Panel containing all process values"""
     
     value_clicked = pyqtSignal(str)
     
     def __init__(self, parent=None):
+        self.max_cols = 2
         super().__init__("Procesværdier", parent)
-        self.setFont(QFont('Segoe UI', 11, QFont.Bold))
-        
-        self.widgets = {}
-        self.layout = QGridLayout()
-        self.setLayout(self.layout)
-        
+    
+    def _create_layout(self):
+        """Grid layout, filled from the top-left"""
         self.next_row = 0
         self.next_col = 0
-        self.max_cols = 2
+        return QGridLayout()
     
     def add_process_value(self, symbol_config):
         """Add a process value widget"""
-        widget = ProcessValueWidget(symbol_config)
-        widget.clicked.connect(self.value_clicked.emit)
-        
-        self.layout.addWidget(widget, self.next_row, self.next_col)
-        self.widgets[symbol_config['name']] = widget
+        self.add_process_values((symbol_config,))
+    
+    def add_process_values(self, symbol_configs):
+        """
+        Add several process value widgets with repaints suspended (prefer for bulk loads)
         
-        # Update grid position
-        self.next_col += 1
-        if self.next_col >= self.max_cols:
-            self.next_col = 0
-            self.next_row += 1
+        Args:
+            symbol_configs: Iterable of process value symbol configurations
+        """
+        self.setUpdatesEnabled(False)
+        try:
+            for symbol_config in symbol_configs:
+                widget = ProcessValueWidget(symbol_config)
+                widget.clicked.connect(self.value_clicked)
+                
+                self.layout.addWidget(widget, self.next_row, self.next_col)
+                self.widgets[symbol_config['name']] = widget
+                
+                # Update grid position
+                self.next_col += 1
+                if self.next_col >= self.max_cols:
+                    self.next_col = 0
+                    self.next_row += 1
+        finally:
+            self.setUpdatesEnabled(True)
     
     def update_value(self, symbol_name: str, value: float):
         """Update process value"""
@@ -373,28 +460,36 @@ class ProcessValuePanel(QGroupBox):
             self.widgets[symbol_name].set_alarm_state(has_alarm)
 
 
-class SwitchPanel(QGroupBox):
+class SwitchPanel(_SymbolPanel):
     """Panel containing all switches"""
     
     value_changed = pyqtSignal(str, int)
     
     def __init__(self, parent=None):
         super().__init__("Switches", parent)
-        self.setFont(QFont('Segoe UI', 11, QFont.Bold))
-        
-        self.widgets = {}
-        self.layout = QVBoxLayout()
-        self.layout.addStretch()
-        self.setLayout(self.layout)
     
     def add_switch(self, symbol_config):
         """Add a switch widget"""
-        widget = SwitchWidget(symbol_config)
-        widget.value_changed.connect(self.value_changed.emit)
+        self.add_switches((symbol_config,))
+    
+    def add_switches(self, symbol_configs):
+        """
+        Add several switch widgets with repaints suspended (prefer for bulk loads)
         
-        # Insert before stretch
-        self.layout.insertWidget(self.layout.count() - 1, widget)
-        self.widgets[symbol_config['name']] = widget
+        Args:
+            symbol_configs: Iterable of switch symbol configurations
+        """
+        self.setUpdatesEnabled(False)
+        try:
+            for symbol_config in symbol_configs:
+                widget = SwitchWidget(symbol_config)
+                widget.value_changed.connect(self.value_changed)
+                
+                # Insert before stretch
+                self.layout.insertWidget(self.layout.count() - 1, widget)
+                self.widgets[symbol_config['name']] = widget
+        finally:
+            self.setUpdatesEnabled(True)
     
     def update_value(self, symbol_name: str, value: int):
         """Update switch value"""
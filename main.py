@@ -6,28 +6,31 @@ Main window with ADS communication and alarm system integration
 import sys
 import json
 import logging
+from collections import deque
+from datetime import datetime
 from pathlib import Path
-import pyads
+
+try:
+    import orjson  # Optional, parses large generated configs faster
+except ImportError:
+    orjson = None
 
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QLabel, QLineEdit,
-                             QGroupBox, QTextEdit, QSplitter, QMessageBox)
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont, QIcon
+                             QGroupBox, QPlainTextEdit, QSplitter, QMessageBox)
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal, pyqtSlot
+from PyQt5.QtGui import QFont, QIcon, QTextCursor
 
 from ads_client import ADSClient
+from ads_worker import ADSWorker
 from ads_symbol_parser import SymbolParser
 from alarm_manager import AlarmManager
 from alarm_logger import AlarmLogger
 from alarm_banner import AlarmBanner
-from alarm_history_window import AlarmHistoryWindow
-from gui_panels import SetpointPanel, ProcessValuePanel, SwitchPanel
-from symbol_auto_config import SymbolAutoConfig
-from tmc_config_generator import TMCConfigGenerator
-from struct_reader import StructReader
+from gui_panels import SetpointPanel, ProcessValuePanel, SwitchPanel, PANEL_STYLESHEET, panel_font
 
 logging.basicConfig(
-    level=logging.DEBUG,  # Changed to DEBUG for troubleshooting
+    level=logging.INFO,  # Overridden by 'logging.level' in config.json
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
@@ -36,12 +39,99 @@ logger = logging.getLogger(__name__)
 class TwinCATHMI(QMainWindow):
     """Main HMI application window"""
     
+    # ADS device notification (symbol_name, value), emitted from the ADS thread
+    notification_received = pyqtSignal(str, object)
+    
+    # Requests to the ADS worker thread
+    polling_start_requested = pyqtSignal(object, int)
+    write_requested = pyqtSignal(dict, int)
+    scan_requested = pyqtSignal(int)
+    disconnect_requested = pyqtSignal()
+    
+    # Writes within this window are sent to the PLC as one sum write (ms)
+    WRITE_COALESCE_INTERVAL = 20
+    
+    # STRUCT symbol type -> member holding the live value
+    STRUCT_VALUE_FIELDS = {
+        'setpoint': 'Value',
+        'process_value': 'Value',
+        'switch': 'Position',
+        'alarm': 'Active',
+    }
+    
+    # STRUCT symbol type -> builder method for its widget/alarm config
+    STRUCT_CONFIG_BUILDERS = {
+        'setpoint': '_struct_setpoint_config',
+        'process_value': '_struct_process_value_config',
+        'switch': '_struct_switch_config',
+        'alarm': '_struct_alarm_config',
+    }
+    
+    # Alarm limit key in symbol configs -> HMI attribute name
+    ALARM_LIMIT_ATTRIBUTES = (
+        ('high_high', 'AlarmHighHigh'),
+        ('high', 'AlarmHigh'),
+        ('low', 'AlarmLow'),
+        ('low_low', 'AlarmLowLow'),
+    )
+    
+    # Manual symbol config: category -> HMI tag attribute
+    MANUAL_CATEGORY_TAGS = {
+        'setpoint': 'HMI_SP',
+        'process_value': 'HMI_PV',
+        'switch': 'HMI_SWITCH',
+        'alarm': 'HMI_ALARM',
+    }
+    
+    # Manual symbol config key -> (HMI attribute, convert value with str())
+    MANUAL_ATTRIBUTES = (
+        ('unit', 'Unit', False),
+        ('min', 'Min', True),
+        ('max', 'Max', True),
+        ('decimals', 'Decimals', True),
+        ('step', 'Step', True),
+        ('alarm_high_high', 'AlarmHighHigh', True),
+        ('alarm_high', 'AlarmHigh', True),
+        ('alarm_low', 'AlarmLow', True),
+        ('alarm_low_low', 'AlarmLowLow', True),
+        ('alarm_priority', 'AlarmPriority', True),
+        ('alarm_text', 'AlarmText', False),
+    )
+    
+    # Alarm check interval while values arrive as notifications (ms)
+    NOTIFICATION_FALLBACK_INTERVAL = 5000
+    
+    # Info panel: messages kept, and how long messages are collected before display (ms)
+    INFO_PANEL_MESSAGES = 4
+    INFO_FLUSH_INTERVAL = 100
+    
     def __init__(self):
         super().__init__()
         
         # Load configuration
         self.config = self.load_config()
         
+        # Symbol mode is fixed for the session; read it once instead of per update/write
+        self.use_structs = bool(self.config.get('use_structs', False))
+        self._log_alarms_to_csv = bool(self.config['alarms'].get('log_to_csv', True))
+        
+        # Log level from config, e.g. "DEBUG" for troubleshooting
+        log_level = str(self.config.get('logging', {}).get('level', 'INFO')).upper()
+        level = logging.getLevelName(log_level)
+        if not isinstance(level, int):
+            logger.warning("Unknown log level '%s' in config, using INFO", log_level)
+            level = logging.INFO
+        logging.getLogger().setLevel(level)
+        
+        # Symbols per ADS sum write; at least 1
+        batch_size = self.config['ads'].get('write_batch_size', ADSClient.DEFAULT_WRITE_BATCH_SIZE)
+        try:
+            self._write_batch_size = max(1, int(batch_size))
+        except (TypeError, ValueError):
+            logger.warning("Invalid write_batch_size '%s' in config, using %d",
+                           batch_size, ADSClient.DEFAULT_WRITE_BATCH_SIZE)
+            self._write_batch_size = ADSClient.DEFAULT_WRITE_BATCH_SIZE
+        
         # Initialize components
         self.ads_client = None
         self.symbol_parser = SymbolParser()
@@ -57,6 +147,67 @@ class TwinCATHMI(QMainWindow):
         self.symbol_configs = []
         self.current_values = {}
         
+        # Names of all displayed symbols, cached when widgets are created
+        self._all_symbol_names = ()
+        
+        # Bound widget methods per symbol name (set in create_symbol_widgets)
+        self._update_fn = {}
+        self._alarm_state_fn = {}
+        
+        # Symbols shown with alarm state, so only changes are pushed to widgets
+        self._prev_alarm_symbols = set()
+        self._shown_alarm_revision = None  # AlarmManager.revision last shown
+        
+        # IDs of active alarms already written to the CSV log
+        self._logged_alarm_ids = set()
+        
+        # Info panel messages, newest last; a message may span several lines
+        self._info_messages = deque(
+            ['Velkommen til TwinCAT HMI\nTryk "Forbind" for at starte...'],
+            maxlen=self.INFO_PANEL_MESSAGES)
+        self._info_flush_timer = QTimer(self)
+        self._info_flush_timer.setSingleShot(True)
+        self._info_flush_timer.timeout.connect(self.flush_info_messages)
+        
+        # True while values arrive as ADS notifications instead of polling
+        self._notifications_active = False
+        self._notification_paths = {}  # Subscribed PLC path -> symbol name
+        self._unsubscribed_paths = ()  # Paths whose notification failed; polled instead
+        
+        # STRUCT mode: PLC path of each value field -> symbol name, read in one sum read
+        self._struct_value_paths = {}
+        self._struct_read_names = ()
+        self.notification_received.connect(self.on_notification, Qt.QueuedConnection)
+        
+        # ADS reads/writes run on a worker thread so slow PLC calls don't block the UI
+        self._ads_thread = QThread(self)
+        self._ads_worker = ADSWorker()
+        self._ads_worker.moveToThread(self._ads_thread)
+        self.polling_start_requested.connect(self._ads_worker.start_polling)
+        self.write_requested.connect(self._ads_worker.do_write)
+        self.scan_requested.connect(self._ads_worker.do_scan)
+        # Blocks until the worker has finished its current call and closed the port
+        self.disconnect_requested.connect(self._ads_worker.do_disconnect,
+                                          Qt.BlockingQueuedConnection)
+        self._ads_worker.values_ready.connect(self.on_values_ready)
+        self._ads_worker.read_failed.connect(self.on_read_failed)
+        self._ads_worker.write_done.connect(self.on_write_done)
+        self._ads_worker.scan_finished.connect(self.on_scan_finished)
+        self._ads_thread.start()
+        
+        # PLC scan running on the ADS worker (silent = started by discovery)
+        self._scan_running = False
+        self._scan_silent = False
+        
+        # Bumped on disconnect; scan results from an earlier connection are dropped
+        self._connection_generation = 0
+        
+        # Pending writes (symbol_name: value), flushed together by a single-shot timer
+        self._pending_writes = {}
+        self._write_flush_timer = QTimer(self)
+        self._write_flush_timer.setSingleShot(True)
+        self._write_flush_timer.timeout.connect(self.flush_writes)
+        
         # Setup UI
         self.setup_ui()
         
@@ -70,14 +221,15 @@ class TwinCATHMI(QMainWindow):
         """Load configuration from config.json"""
         config_file = Path('config.json')
         
-        if config_file.exists():
-            try:
-                with open(config_file, 'r') as f:
-                    config = json.load(f)
-                logger.info("Configuration loaded")
-                return config
-            except Exception as e:
-                logger.error(f"Failed to load config: {e}")
+        try:
+            data = config_file.read_bytes()
+            config = orjson.loads(data) if orjson else json.loads(data)
+            logger.info("Configuration loaded")
+            return config
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error("Failed to load config: %s", e)
         
         # Default configuration
         return {
@@ -113,6 +265,9 @@ class TwinCATHMI(QMainWindow):
                         gui_config.get('window_width', 1200), 
                         gui_config.get('window_height', 800))
         
+        # Panel widget styles (parsed once for all child widgets)
+        self.setStyleSheet(PANEL_STYLESHEET)
+        
         # Central widget
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -171,7 +326,7 @@ class TwinCATHMI(QMainWindow):
     def create_connection_panel(self) -> QGroupBox:
         """Create connection control panel"""
         panel = QGroupBox('Forbindelse')
-        panel.setFont(QFont('Segoe UI', 11, QFont.Bold))
+        panel.setFont(panel_font(11, bold=True))
         
         layout = QHBoxLayout()
         
@@ -197,7 +352,7 @@ class TwinCATHMI(QMainWindow):
         
         # Status indicator
         self.status_label = QLabel('●')
-        self.status_label.setFont(QFont('Segoe UI', 16))
+        self.status_label.setFont(panel_font(16))
         self.status_label.setStyleSheet('color: red;')
         layout.addWidget(self.status_label)
         
@@ -211,9 +366,9 @@ class TwinCATHMI(QMainWindow):
         layout.addWidget(self.sound_button)
         
         # Scan PLC button
-        scan_button = QPushButton('🔍 Scan PLC')
-        scan_button.clicked.connect(self.scan_plc_symbols)
-        layout.addWidget(scan_button)
+        self.scan_button = QPushButton('🔍 Scan PLC')
+        self.scan_button.clicked.connect(self.scan_plc_symbols)
+        layout.addWidget(self.scan_button)
         
         # Help button
         help_button = QPushButton('❓ Hjælp')
@@ -226,16 +381,16 @@ class TwinCATHMI(QMainWindow):
     def create_info_panel(self) -> QGroupBox:
         """Create information panel"""
         panel = QGroupBox('Information')
-        panel.setFont(QFont('Segoe UI', 10, QFont.Bold))
+        panel.setFont(panel_font(10, bold=True))
         panel.setMaximumHeight(120)
         
         layout = QVBoxLayout()
         
-        self.info_text = QTextEdit()
+        self.info_text = QPlainTextEdit()
         self.info_text.setReadOnly(True)
         self.info_text.setMaximumHeight(80)
         self.info_text.setFont(QFont('Courier New', 9))
-        self.info_text.setText('Velkommen til TwinCAT HMI\nTryk "Forbind" for at starte...')
+        self.info_text.setPlainText('\n'.join(self._info_messages))
         
         layout.addWidget(self.info_text)
         panel.setLayout(layout)
@@ -262,16 +417,18 @@ class TwinCATHMI(QMainWindow):
             if self.ads_client.connect():
                 self.connected = True
                 self.update_connection_ui(True)
+                self._ads_worker.set_client(self.ads_client)
                 
-                # Initialize StructReader
-                self.struct_reader = StructReader(self.ads_client.plc)
+                # Initialize StructReader (imported on first connect)
+                from struct_reader import StructReader
+                self.struct_reader = StructReader(self.ads_client)
                 
                 # Discover symbols
                 self.discover_symbols()
                 
-                # Start update timer
-                update_interval = int(self.config['ads']['update_interval'] * 1000)
-                self.update_timer.start(update_interval)
+                # A startup scan finishes discovery and starts updates itself
+                if not self._scan_running:
+                    self.start_updates()
                 
                 self.add_info_message('Forbundet til PLC')
                 self.statusBar().showMessage('Forbundet')
@@ -280,21 +437,48 @@ class TwinCATHMI(QMainWindow):
                 raise Exception('Connection failed')
                 
         except Exception as e:
-            logger.error(f"Connection error: {e}")
+            logger.error("Connection error: %s", e)
             QMessageBox.critical(self, 'Forbindelsesfejl', 
                                f'Kunne ikke forbinde til PLC:\n{e}')
             self.connected = False
             self.update_connection_ui(False)
     
+    def start_updates(self):
+        """
+        Start value updates for the discovered symbols
+        
+        Device notifications are used when available. The GUI timer then
+        only re-checks alarms, and symbols without a notification are
+        polled. Otherwise the ADS worker polls all symbols; in STRUCT mode
+        it polls the structs' value fields.
+        """
+        update_interval = int(self.config['ads']['update_interval'] * 1000)
+        if self.start_notifications():
+            self.update_timer.start(self.NOTIFICATION_FALLBACK_INTERVAL)
+            if self._unsubscribed_paths:
+                self.polling_start_requested.emit(self._unsubscribed_paths, update_interval)
+        elif self.use_structs:
+            self.polling_start_requested.emit(self._struct_read_names, update_interval)
+        else:
+            self.polling_start_requested.emit(self._all_symbol_names, update_interval)
+    
     def disconnect_from_plc(self):
         """Disconnect from PLC"""
         try:
             # Stop timer
             self.update_timer.stop()
             
-            # Disconnect
-            if self.ads_client:
-                self.ads_client.disconnect()
+            # Drop queued writes and results of a scan still running
+            self._notifications_active = False
+            self._write_flush_timer.stop()
+            self._pending_writes = {}
+            self._connection_generation += 1
+            self._scan_running = False
+            self.scan_button.setEnabled(True)
+            
+            # Stops polling and disconnects on the ADS worker (also deletes
+            # device notifications) once its current read or scan is done
+            self.disconnect_requested.emit()
             
             self.connected = False
             self.update_connection_ui(False)
@@ -303,7 +487,7 @@ class TwinCATHMI(QMainWindow):
             self.statusBar().showMessage('Ikke forbundet')
             
         except Exception as e:
-            logger.error(f"Disconnect error: {e}")
+            logger.error("Disconnect error: %s", e)
     
     def update_connection_ui(self, connected: bool):
         """Update UI based on connection state"""
@@ -322,7 +506,7 @@ class TwinCATHMI(QMainWindow):
         """Discover and parse PLC symbols"""
         try:
             # Check if using STRUCT-based approach
-            if self.config.get('use_structs', False):
+            if self.use_structs:
                 logger.info("Using STRUCT-based symbol discovery")
                 self.add_info_message('Bruger STRUCT-baseret symbol læsning...')
                 self.discover_symbols_from_structs()
@@ -333,7 +517,7 @@ class TwinCATHMI(QMainWindow):
             # Check if TMC file is configured
             tmc_file = self.config.get('tmc_file')
             if tmc_file and Path(tmc_file).exists():
-                logger.info(f"Loading metadata from TMC file: {tmc_file}")
+                logger.info("Loading metadata from TMC file: %s", tmc_file)
                 self.add_info_message('Loader metadata fra TMC fil...')
                 if self.load_from_tmc(tmc_file):
                     return
@@ -341,7 +525,7 @@ class TwinCATHMI(QMainWindow):
                     logger.warning("Failed to load from TMC, falling back to auto-scan")
                     self.add_info_message('TMC load fejlede, scanner PLC...')
             elif tmc_file:
-                logger.warning(f"TMC file configured but not found: {tmc_file}")
+                logger.warning("TMC file configured but not found: %s", tmc_file)
                 self.add_info_message(f'TMC fil ikke fundet: {tmc_file}')
             
             # Check if manual configuration exists and is not auto-discovered
@@ -353,10 +537,20 @@ class TwinCATHMI(QMainWindow):
             if not has_manual or (is_auto and self.config.get('auto_scan_on_start', True)):
                 logger.info("No manual symbols or auto-scan enabled, running PLC scan...")
                 self.add_info_message('Ingen manuel konfiguration, scanner PLC...')
+                # Discovery continues in on_scan_finished
                 if self.scan_plc_symbols(silent=True):
-                    # Reload config after scan
-                    self.config = self.load_config()
-                    manual_symbols = self.config.get('manual_symbols', {})
+                    return
+            
+            self.discover_configured_symbols()
+            
+        except Exception as e:
+            logger.error("Symbol discovery error: %s", e, exc_info=True)
+            self.add_info_message(f'Fejl ved symbol søgning: {e}')
+    
+    def discover_configured_symbols(self):
+        """Load manual symbols, or discover symbols by their HMI comment tags"""
+        try:
+            manual_symbols = self.config.get('manual_symbols', {})
             
             # Check if manual configuration is enabled
             if manual_symbols.get('enabled', False):
@@ -404,7 +598,7 @@ class TwinCATHMI(QMainWindow):
             self.add_info_message(info_msg)
             
         except Exception as e:
-            logger.error(f"Symbol discovery error: {e}", exc_info=True)
+            logger.error("Symbol discovery error: %s", e, exc_info=True)
             self.add_info_message(f'Fejl ved symbol søgning: {e}')
     
     def discover_symbols_from_structs(self):
@@ -419,9 +613,13 @@ class TwinCATHMI(QMainWindow):
             struct_config = self.config.get('struct_symbols', {})
             base_path = self.config.get('hmi_struct_path', 'MAIN.HMI')
             
-            logger.info(f"Reading STRUCTs from {base_path}")
+            logger.info("Reading STRUCTs from %s", base_path)
             self.add_info_message(f'Læser STRUCTs fra {base_path}...')
             
+            # Nothing is polled until the STRUCTs have been read
+            self._struct_value_paths = {}
+            self._struct_read_names = ()
+            
             # Read all symbols
             all_symbols = self.struct_reader.read_all_symbols(struct_config, base_path)
             
@@ -430,6 +628,13 @@ class TwinCATHMI(QMainWindow):
                 self.add_info_message('Ingen STRUCT symboler fundet')
                 return
             
+            # Value fields polled on every update, only for STRUCTs that were read
+            self._struct_value_paths = {
+                f"{sym_data['path']}.{self.STRUCT_VALUE_FIELDS[sym_data['type']]}": sym_data['path']
+                for sym_data in all_symbols.values()
+            }
+            self._struct_read_names = tuple(self._struct_value_paths)
+            
             # Convert STRUCT data to widget format
             categorized = {
                 'setpoint': [],
@@ -438,68 +643,19 @@ class TwinCATHMI(QMainWindow):
                 'alarm': []
             }
             
+            # Resolve builders once, not per symbol
+            builders = {
+                sym_type: getattr(self, builder)
+                for sym_type, builder in self.STRUCT_CONFIG_BUILDERS.items()
+            }
+            
             for sym_name, sym_data in all_symbols.items():
                 sym_type = sym_data['type']
-                sym_path = sym_data['path']
-                data = sym_data['data']
-                
-                if sym_type == 'setpoint':
-                    categorized['setpoint'].append({
-                        'name': sym_path,
-                        'display_name': data['display']['name'] or sym_name,
-                        'unit': data['config']['unit'],
-                        'min': data['config']['min'],
-                        'max': data['config']['max'],
-                        'decimals': data['config']['decimals'],
-                        'step': data['config']['step'],
-                        'alarm_limits': {
-                            'high_high': data['alarm_limits']['high_high'],
-                            'high': data['alarm_limits']['high'],
-                            'low': data['alarm_limits']['low'],
-                            'low_low': data['alarm_limits']['low_low'],
-                        },
-                        'alarm_priority': data['alarm_limits']['priority'],
-                        'value': data['value']
-                    })
-                
-                elif sym_type == 'process_value':
-                    categorized['process_value'].append({
-                        'name': sym_path,
-                        'display_name': data['display']['name'] or sym_name,
-                        'unit': data['config']['unit'],
-                        'decimals': data['config']['decimals'],
-                        'alarm_limits': {
-                            'high_high': data['alarm_limits']['high_high'],
-                            'high': data['alarm_limits']['high'],
-                            'low': data['alarm_limits']['low'],
-                            'low_low': data['alarm_limits']['low_low'],
-                        },
-                        'alarm_priority': data['alarm_limits']['priority'],
-                        'value': data['value'],
-                        'quality': data['quality'],
-                        'sensor_fault': data['sensor_fault']
-                    })
-                
-                elif sym_type == 'switch':
-                    # Convert labels list to positions dict for GUI compatibility
-                    labels = data['config']['labels']
-                    positions_dict = {str(i): label for i, label in enumerate(labels)}
-                    
-                    categorized['switch'].append({
-                        'name': sym_path,
-                        'display_name': data['display']['name'] or sym_name,
-                        'positions': positions_dict,
-                        'value': data['position']
-                    })
-                
-                elif sym_type == 'alarm':
-                    categorized['alarm'].append({
-                        'name': sym_path,
-                        'display_name': data['display']['name'] or sym_name,
-                        'text': data['text'],
-                        'priority': data['priority'],
-                        'value': data['active']
-                    })
+                build = builders.get(sym_type)
+                if build is not None:
+                    categorized[sym_type].append(
+                        build(sym_name, sym_data['path'], sym_data['data'])
+                    )
             
             # Create UI elements
             self.create_symbol_widgets(categorized)
@@ -516,12 +672,75 @@ class TwinCATHMI(QMainWindow):
                        f"  Switches: {len(categorized['switch'])}\n"
                        f"  Alarmer: {len(categorized['alarm'])}")
             self.add_info_message(info_msg)
-            logger.info(f"Successfully loaded {len(all_symbols)} STRUCT symbols")
+            logger.info("Successfully loaded %d STRUCT symbols", len(all_symbols))
             
         except Exception as e:
-            logger.error(f"STRUCT symbol discovery error: {e}", exc_info=True)
+            logger.error("STRUCT symbol discovery error: %s", e, exc_info=True)
             self.add_info_message(f'FEJL ved STRUCT læsning: {e}')
     
+    def _struct_setpoint_config(self, sym_name: str, sym_path: str, data: dict) -> dict:
+        """Widget config for a setpoint STRUCT"""
+        config = data['config']
+        limits = data['alarm_limits']
+        return {
+            'name': sym_path,
+            'display_name': data['display']['name'] or sym_name,
+            'unit': config['unit'],
+            'min': config['min'],
+            'max': config['max'],
+            'decimals': config['decimals'],
+            'step': config['step'],
+            'alarm_limits': {
+                'high_high': limits['high_high'],
+                'high': limits['high'],
+                'low': limits['low'],
+                'low_low': limits['low_low'],
+            },
+            'alarm_priority': limits['priority'],
+            'value': data['value']
+        }
+    
+    def _struct_process_value_config(self, sym_name: str, sym_path: str, data: dict) -> dict:
+        """Widget config for a process value STRUCT"""
+        config = data['config']
+        limits = data['alarm_limits']
+        return {
+            'name': sym_path,
+            'display_name': data['display']['name'] or sym_name,
+            'unit': config['unit'],
+            'decimals': config['decimals'],
+            'alarm_limits': {
+                'high_high': limits['high_high'],
+                'high': limits['high'],
+                'low': limits['low'],
+                'low_low': limits['low_low'],
+            },
+            'alarm_priority': limits['priority'],
+            'value': data['value'],
+            'quality': data['quality'],
+            'sensor_fault': data['sensor_fault']
+        }
+    
+    def _struct_switch_config(self, sym_name: str, sym_path: str, data: dict) -> dict:
+        """Widget config for a switch STRUCT"""
+        # Labels list -> (position, label) pairs as expected by SwitchWidget
+        return {
+            'name': sym_path,
+            'display_name': data['display']['name'] or sym_name,
+            'positions': tuple(enumerate(data['config']['labels'])),
+            'value': data['position']
+        }
+    
+    def _struct_alarm_config(self, sym_name: str, sym_path: str, data: dict) -> dict:
+        """Config for an alarm STRUCT"""
+        return {
+            'name': sym_path,
+            'display_name': data['display']['name'] or sym_name,
+            'text': data['text'],
+            'priority': data['priority'],
+            'value': data['active']
+        }
+    
     def load_from_tmc(self, tmc_file: str) -> bool:
         """
         Load symbol configuration from TMC file
@@ -533,11 +752,12 @@ class TwinCATHMI(QMainWindow):
             True if successful, False otherwise
         """
         try:
-            logger.info(f"Parsing TMC file: {tmc_file}")
+            logger.info("Parsing TMC file: %s", tmc_file)
             
-            # Parse TMC file
-            generator = TMCConfigGenerator(tmc_file)
-            tmc_config = generator.generate_config()
+            # Parse TMC file (XML parser only loaded when a TMC file is used)
+            # and reused on reconnect/rescan while the file is unchanged
+            from tmc_config_generator import generate_config_cached
+            tmc_config = generate_config_cached(tmc_file)
             
             # Get symbols from TMC
             tmc_symbols = tmc_config.get('symbols', {})
@@ -552,23 +772,27 @@ class TwinCATHMI(QMainWindow):
                 logger.warning("No HMI symbols found in TMC file")
                 return False
             
-            logger.info(f"Found {total_count} HMI symbols in TMC")
+            logger.info("Found %d HMI symbols in TMC", total_count)
             self.add_info_message(f'Fundet {total_count} HMI symboler i TMC fil')
             
+            # Verify which symbols exist in PLC with one sum read
+            tmc_names = [entry['name'] for entries in tmc_symbols.values() for entry in entries]
+            in_plc = self.ads_client.read_multiple_symbols(tmc_names)
+            
+            missing = [name for name in tmc_names if name not in in_plc]
+            if missing:
+                logger.warning("%d TMC symbols not found in PLC: %s",
+                               len(missing), ', '.join(missing))
+            
             # Build symbol dict for parser
             symbols = {}
+            alarm_limit_attrs = self.ALARM_LIMIT_ATTRIBUTES
             
             # Process setpoints
             for sp in tmc_symbols.get('setpoints', []):
                 symbol_name = sp['name']
                 # Verify symbol exists in PLC
-                try:
-                    value = self.ads_client.read_symbol(symbol_name)
-                    if value is None:
-                        logger.warning(f"Setpoint {symbol_name} not found in PLC")
-                        continue
-                except Exception as e:
-                    logger.warning(f"Could not read setpoint {symbol_name}: {e}")
+                if symbol_name not in in_plc:
                     continue
                 
                 # Build attributes string for parser
@@ -584,14 +808,9 @@ class TwinCATHMI(QMainWindow):
                 # Add alarm limits if present
                 if 'alarm_limits' in sp:
                     limits = sp['alarm_limits']
-                    if 'high_high' in limits:
-                        attrs['AlarmHighHigh'] = str(limits['high_high'])
-                    if 'high' in limits:
-                        attrs['AlarmHigh'] = str(limits['high'])
-                    if 'low' in limits:
-                        attrs['AlarmLow'] = str(limits['low'])
-                    if 'low_low' in limits:
-                        attrs['AlarmLowLow'] = str(limits['low_low'])
+                    for key, attr in alarm_limit_attrs:
+                        if key in limits:
+                            attrs[attr] = str(limits[key])
                     attrs['AlarmPriority'] = str(sp.get('alarm_priority', 3))
                 
                 symbols[symbol_name] = {
@@ -604,13 +823,7 @@ class TwinCATHMI(QMainWindow):
             # Process process values
             for pv in tmc_symbols.get('process_values', []):
                 symbol_name = pv['name']
-                try:
-                    value = self.ads_client.read_symbol(symbol_name)
-                    if value is None:
-                        logger.warning(f"Process value {symbol_name} not found in PLC")
-                        continue
-                except Exception as e:
-                    logger.warning(f"Could not read process value {symbol_name}: {e}")
+                if symbol_name not in in_plc:
                     continue
                 
                 attrs = {
@@ -622,14 +835,9 @@ class TwinCATHMI(QMainWindow):
                 # Add alarm limits if present
                 if 'alarm_limits' in pv:
                     limits = pv['alarm_limits']
-                    if 'high_high' in limits:
-                        attrs['AlarmHighHigh'] = str(limits['high_high'])
-                    if 'high' in limits:
-                        attrs['AlarmHigh'] = str(limits['high'])
-                    if 'low' in limits:
-                        attrs['AlarmLow'] = str(limits['low'])
-                    if 'low_low' in limits:
-                        attrs['AlarmLowLow'] = str(limits['low_low'])
+                    for key, attr in alarm_limit_attrs:
+                        if key in limits:
+                            attrs[attr] = str(limits[key])
                     attrs['AlarmPriority'] = str(pv.get('alarm_priority', 3))
                 
                 symbols[symbol_name] = {
@@ -642,13 +850,7 @@ class TwinCATHMI(QMainWindow):
             # Process switches
             for sw in tmc_symbols.get('switches', []):
                 symbol_name = sw['name']
-                try:
-                    value = self.ads_client.read_symbol(symbol_name)
-                    if value is None:
-                        logger.warning(f"Switch {symbol_name} not found in PLC")
-                        continue
-                except Exception as e:
-                    logger.warning(f"Could not read switch {symbol_name}: {e}")
+                if symbol_name not in in_plc:
                     continue
                 
                 attrs = {'HMI_SWITCH': True}
@@ -668,13 +870,7 @@ class TwinCATHMI(QMainWindow):
             # Process alarms
             for alarm in tmc_symbols.get('alarms', []):
                 symbol_name = alarm['name']
-                try:
-                    value = self.ads_client.read_symbol(symbol_name)
-                    if value is None:
-                        logger.warning(f"Alarm {symbol_name} not found in PLC")
-                        continue
-                except Exception as e:
-                    logger.warning(f"Could not read alarm {symbol_name}: {e}")
+                if symbol_name not in in_plc:
                     continue
                 
                 attrs = {
@@ -690,7 +886,7 @@ class TwinCATHMI(QMainWindow):
                     'attributes': attrs
                 }
             
-            logger.info(f"Successfully built symbol dict with {len(symbols)} symbols")
+            logger.info("Successfully built symbol dict with %d symbols", len(symbols))
             
             # Parse symbols
             categorized = self.symbol_parser.parse_symbols(symbols)
@@ -701,6 +897,10 @@ class TwinCATHMI(QMainWindow):
             # Store symbols with alarms
             self.symbol_configs = self.symbol_parser.get_symbols_with_alarms()
             
+            # Show the values from the existence check right away, so the
+            # first poll only has to dispatch what changed since
+            self.on_values_ready(in_plc)
+            
             info_msg = (f"Indlæst fra TMC ({len(symbols)} symboler):\n"
                        f"  Setpunkter: {len(categorized['setpoint'])}\n"
                        f"  Procesværdier: {len(categorized['process_value'])}\n"
@@ -711,11 +911,11 @@ class TwinCATHMI(QMainWindow):
             return True
             
         except FileNotFoundError:
-            logger.error(f"TMC file not found: {tmc_file}")
+            logger.error("TMC file not found: %s", tmc_file)
             self.add_info_message(f'TMC fil ikke fundet: {tmc_file}')
             return False
         except Exception as e:
-            logger.error(f"Error loading from TMC: {e}", exc_info=True)
+            logger.error("Error loading from TMC: %s", e, exc_info=True)
             self.add_info_message(f'Fejl ved TMC indlæsning: {e}')
             return False
     
@@ -728,17 +928,18 @@ class TwinCATHMI(QMainWindow):
                 logger.error("No manual symbols configured")
                 return
             
+            # Verify which symbols exist in PLC with one sum read
+            in_plc = self.ads_client.read_multiple_symbols(list(manual_config))
+            
+            missing = [name for name in manual_config if name not in in_plc]
+            if missing:
+                logger.warning("%d manual symbols not found in PLC, skipping: %s",
+                               len(missing), ', '.join(missing))
+            
             # Build symbol dict in expected format
             symbols = {}
             for symbol_name, config in manual_config.items():
-                # Verify symbol exists in PLC
-                try:
-                    value = self.ads_client.read_symbol(symbol_name)
-                    if value is None:
-                        logger.warning(f"Symbol {symbol_name} not found in PLC, skipping")
-                        continue
-                except:
-                    logger.warning(f"Could not read {symbol_name}, skipping")
+                if symbol_name not in in_plc:
                     continue
                 
                 # Build symbol info
@@ -749,7 +950,7 @@ class TwinCATHMI(QMainWindow):
                     'attributes': self._build_attributes_from_config(config)
                 }
             
-            logger.info(f"Loaded {len(symbols)} manual symbols")
+            logger.info("Loaded %d manual symbols", len(symbols))
             
             # Parse symbols
             categorized = self.symbol_parser.parse_symbols(symbols)
@@ -760,6 +961,9 @@ class TwinCATHMI(QMainWindow):
             # Store symbols with alarms
             self.symbol_configs = self.symbol_parser.get_symbols_with_alarms()
             
+            # Show the values from the existence check right away
+            self.on_values_ready(in_plc)
+            
             info_msg = (f"Indlæst {len(symbols)} manuelle symboler:\n"
                        f"  Setpunkter: {len(categorized['setpoint'])}\n"
                        f"  Procesværdier: {len(categorized['process_value'])}\n"
@@ -768,50 +972,23 @@ class TwinCATHMI(QMainWindow):
             self.add_info_message(info_msg)
             
         except Exception as e:
-            logger.error(f"Error loading manual symbols: {e}", exc_info=True)
+            logger.error("Error loading manual symbols: %s", e, exc_info=True)
             self.add_info_message(f'Fejl ved indlæsning af symboler: {e}')
     
     def _build_attributes_from_config(self, config: dict) -> dict:
         """Build attributes dict from manual config"""
         attributes = {}
         
-        category = config.get('category', '')
-        
         # Add category tag
-        if category == 'setpoint':
-            attributes['HMI_SP'] = 'true'
-        elif category == 'process_value':
-            attributes['HMI_PV'] = 'true'
-        elif category == 'switch':
-            attributes['HMI_SWITCH'] = 'true'
-        elif category == 'alarm':
-            attributes['HMI_ALARM'] = 'true'
-        
-        # Add common attributes
-        if 'unit' in config:
-            attributes['Unit'] = config['unit']
-        if 'min' in config:
-            attributes['Min'] = str(config['min'])
-        if 'max' in config:
-            attributes['Max'] = str(config['max'])
-        if 'decimals' in config:
-            attributes['Decimals'] = str(config['decimals'])
-        if 'step' in config:
-            attributes['Step'] = str(config['step'])
-        
-        # Add alarm limits
-        if 'alarm_high_high' in config:
-            attributes['AlarmHighHigh'] = str(config['alarm_high_high'])
-        if 'alarm_high' in config:
-            attributes['AlarmHigh'] = str(config['alarm_high'])
-        if 'alarm_low' in config:
-            attributes['AlarmLow'] = str(config['alarm_low'])
-        if 'alarm_low_low' in config:
-            attributes['AlarmLowLow'] = str(config['alarm_low_low'])
-        if 'alarm_priority' in config:
-            attributes['AlarmPriority'] = str(config['alarm_priority'])
-        if 'alarm_text' in config:
-            attributes['AlarmText'] = config['alarm_text']
+        tag = self.MANUAL_CATEGORY_TAGS.get(config.get('category', ''))
+        if tag is not None:
+            attributes[tag] = 'true'
+        
+        # Add common attributes and alarm limits
+        for key, attr, as_str in self.MANUAL_ATTRIBUTES:
+            if key in config:
+                value = config[key]
+                attributes[attr] = str(value) if as_str else value
         
         # Add switch positions
         if 'positions' in config:
@@ -822,171 +999,288 @@ class TwinCATHMI(QMainWindow):
     
     def create_symbol_widgets(self, categorized: dict):
         """Create UI widgets for discovered symbols"""
-        # Add setpoints
-        for symbol in categorized['setpoint']:
-            self.setpoint_panel.add_setpoint(symbol)
+        # Drop widgets from a previous connection/scan
+        self.setpoint_panel.clear()
+        self.pv_panel.clear()
+        self.switch_panel.clear()
         
-        # Add process values
-        for symbol in categorized['process_value']:
-            self.pv_panel.add_process_value(symbol)
+        # New widgets must get their first value even if it didn't change
+        self.current_values = {}
+        
+        # Add widgets per panel in one batch each
+        self.setpoint_panel.add_setpoints(categorized['setpoint'])
+        self.pv_panel.add_process_values(categorized['process_value'])
+        self.switch_panel.add_switches(categorized['switch'])
         
-        # Add switches
-        for symbol in categorized['switch']:
-            self.switch_panel.add_switch(symbol)
+        # Symbol list for the update loop (read in one batch per tick)
+        self._all_symbol_names = tuple(
+            symbol['name']
+            for category in categorized.values()
+            for symbol in category
+        )
+        
+        # Bind each symbol's widget methods once, so updates need no config
+        # lookup and no panel-level name lookup
+        self._update_fn = {
+            name: widget.set_value
+            for panel in (self.setpoint_panel, self.pv_panel, self.switch_panel)
+            for name, widget in panel.widgets.items()
+        }
+        
+        # Only setpoints and process values show an alarm state
+        self._alarm_state_fn = {
+            name: widget.set_alarm_state
+            for panel in (self.setpoint_panel, self.pv_panel)
+            for name, widget in panel.widgets.items()
+        }
+        self._prev_alarm_symbols = set()
+        self._shown_alarm_revision = None
     
+    def start_notifications(self) -> bool:
+        """
+        Subscribe to ADS device notifications for all displayed symbols
+        
+        Only used when 'use_notifications' is enabled in the ads config. In
+        STRUCT mode the value field of each struct is subscribed. Paths whose
+        notification can't be registered are kept in _unsubscribed_paths so
+        they can be polled.
+        
+        Returns:
+            True if values are now delivered by notifications
+        """
+        self._unsubscribed_paths = ()
+        
+        if not self.config['ads'].get('use_notifications', False):
+            return False
+        
+        # PLC path to subscribe -> symbol name used by widgets and alarms
+        if self.use_structs:
+            targets = self._struct_value_paths
+        else:
+            targets = {name: name for name in self._all_symbol_names}
+        
+        if not targets:
+            return False
+        
+        failed = [
+            path for path in targets
+            if not self.ads_client.add_notification(path, self.notification_received.emit)
+        ]
+        
+        if len(failed) == len(targets):
+            logger.warning("Notifications failed for all symbols, using polling")
+            return False
+        
+        if failed:
+            logger.warning("Notifications failed for %d symbols, polling those: %s",
+                           len(failed), ', '.join(failed))
+            self._unsubscribed_paths = tuple(failed)
+        
+        self._notification_paths = targets
+        self._notifications_active = True
+        logger.info("Subscribed to notifications for %d symbols",
+                    len(targets) - len(failed))
+        return True
+    
+    @pyqtSlot(str, object)
+    def on_notification(self, symbol_name: str, value):
+        """Handle a changed value delivered by an ADS device notification"""
+        if not self._notifications_active:
+            return
+        
+        try:
+            symbol_name = self._notification_paths.get(symbol_name, symbol_name)
+            self.current_values[symbol_name] = value
+            
+            update = self._update_fn.get(symbol_name)
+            if update is not None:
+                update(value)
+            
+            self.alarm_manager.check_alarms({symbol_name: value}, self.symbol_configs)
+            self.update_alarm_indicators()
+            
+        except Exception as e:
+            logger.error("Notification update error: %s", e)
+    
+    @pyqtSlot()
     def update_plc_data(self):
-        """Update data from PLC"""
+        """
+        Re-check alarms on the GUI timer while values arrive as notifications
+        
+        Polled values are read by the ADS worker's own timer instead.
+        """
         if not self.connected or not self.ads_client:
             return
         
         try:
-            # Check if using STRUCT-based approach
-            if self.config.get('use_structs', False) and self.struct_reader:
-                self.update_plc_data_structs()
-                return
-            
-            # Get all symbol names
-            all_symbols = []
+            # Values arrive as notifications; only re-check alarms on the last snapshot
+            if self._notifications_active:
+                self.alarm_manager.check_alarms(self.current_values, self.symbol_configs)
+                self.update_alarm_indicators()
             
-            for category in self.symbol_parser.categorized_symbols.values():
-                all_symbols.extend([s['name'] for s in category])
+        except Exception as e:
+            logger.error("Update error: %s", e)
+            self.add_info_message(f'Fejl ved opdatering: {e}')
+    
+    @pyqtSlot(dict)
+    def on_values_ready(self, values: dict):
+        """Update widgets and alarms with values read by the ADS worker"""
+        if not self.connected:
+            return
+        
+        try:
+            # STRUCT value fields are read by PLC path; widgets and alarms
+            # use the struct's symbol name
+            if self.use_structs:
+                struct_paths = self._struct_value_paths
+                values = {struct_paths[path]: value for path, value in values.items()}
+            
+            # Only values that changed since the last read need any work;
+            # alarm checks on an unchanged value give the same result
+            prev = self.current_values
+            changed = {
+                name: value for name, value in values.items()
+                if name not in prev or prev[name] != value
+            }
             
-            if not all_symbols:
+            if not changed:
                 return
             
-            # Read values
-            values = self.ads_client.read_multiple_symbols(all_symbols)
-            self.current_values = values
+            # Merge, since polled values may be only part of the symbols
+            # (the rest arriving as notifications)
+            prev.update(changed)
             
             # Update UI
-            for symbol_name, value in values.items():
-                symbol_config = self.symbol_parser.get_symbol_config(symbol_name)
-                
-                if not symbol_config:
-                    continue
-                
-                category = symbol_config['category']
-                
-                if category == 'setpoint':
-                    self.setpoint_panel.update_value(symbol_name, value)
-                elif category == 'process_value':
-                    self.pv_panel.update_value(symbol_name, value)
-                elif category == 'switch':
-                    self.switch_panel.update_value(symbol_name, value)
+            update_fn = self._update_fn
+            for symbol_name, value in changed.items():
+                update = update_fn.get(symbol_name)
+                if update is not None:
+                    update(value)
             
             # Check alarms
-            self.alarm_manager.check_alarms(values, self.symbol_configs)
+            self.alarm_manager.check_alarms(changed, self.symbol_configs)
             
             # Update alarm indicators
             self.update_alarm_indicators()
             
         except Exception as e:
-            logger.error(f"Update error: {e}")
+            logger.error("Update error: %s", e)
             self.add_info_message(f'Fejl ved opdatering: {e}')
     
-    def update_plc_data_structs(self):
-        """Update data from PLC using STRUCT approach"""
-        try:
-            struct_config = self.config.get('struct_symbols', {})
-            base_path = self.config.get('hmi_struct_path', 'MAIN.HMI')
-            
-            values = {}
-            
-            # Read setpoints
-            for sp_name in struct_config.get('setpoints', []):
-                full_path = f"{base_path}.{sp_name}"
-                value = self.ads_client.plc.read_by_name(f"{full_path}.Value", pyads.PLCTYPE_REAL)
-                values[full_path] = value
-                self.setpoint_panel.update_value(full_path, value)
-            
-            # Read process values
-            for pv_name in struct_config.get('process_values', []):
-                full_path = f"{base_path}.{pv_name}"
-                value = self.ads_client.plc.read_by_name(f"{full_path}.Value", pyads.PLCTYPE_REAL)
-                values[full_path] = value
-                self.pv_panel.update_value(full_path, value)
-            
-            # Read switches
-            for sw_name in struct_config.get('switches', []):
-                full_path = f"{base_path}.{sw_name}"
-                value = self.ads_client.plc.read_by_name(f"{full_path}.Position", pyads.PLCTYPE_INT)
-                values[full_path] = value
-                self.switch_panel.update_value(full_path, value)
-            
-            # Read alarms
-            for al_name in struct_config.get('alarms', []):
-                full_path = f"{base_path}.{al_name}"
-                value = self.ads_client.plc.read_by_name(f"{full_path}.Active", pyads.PLCTYPE_BOOL)
-                values[full_path] = value
-            
-            self.current_values = values
-            
-            # Check alarms
-            self.alarm_manager.check_alarms(values, self.symbol_configs)
-            
-            # Update alarm indicators
-            self.update_alarm_indicators()
-            
-        except Exception as e:
-            logger.error(f"STRUCT update error: {e}")
-            self.add_info_message(f'Fejl ved STRUCT opdatering: {e}')
+    @pyqtSlot(str)
+    def on_read_failed(self, error: str):
+        """Handle a failed read on the ADS worker"""
+        self.add_info_message(f'Fejl ved opdatering: {error}')
     
     def update_alarm_indicators(self):
         """Update alarm indicators on widgets"""
-        active_alarms = self.alarm_manager.get_active_alarms()
-        alarm_symbols = {a.symbol_name for a in active_alarms}
+        # Nothing was activated or cleared since the last update
+        revision = self.alarm_manager.revision
+        if revision == self._shown_alarm_revision:
+            return
+        self._shown_alarm_revision = revision
         
-        # Update all symbols
-        for symbol_name in self.current_values.keys():
-            has_alarm = symbol_name in alarm_symbols
-            
-            self.setpoint_panel.set_alarm_state(symbol_name, has_alarm)
-            self.pv_panel.set_alarm_state(symbol_name, has_alarm)
+        alarm_symbols = self.alarm_manager.active_symbol_names
+        changed = alarm_symbols ^ self._prev_alarm_symbols
+        if not changed:
+            return
+        
+        # Only touch widgets whose alarm state changed since last update
+        alarm_state_fn = self._alarm_state_fn
+        for symbol_name in changed:
+            set_state = alarm_state_fn.get(symbol_name)
+            if set_state is not None:
+                set_state(symbol_name in alarm_symbols)
+        
+        self._prev_alarm_symbols = set(alarm_symbols)
     
+    @pyqtSlot(str, float)
     def on_setpoint_changed(self, symbol_name: str, value: float):
         """Handle setpoint value change"""
         if not self.connected:
             return
         
-        try:
-            # Check if using STRUCT approach
-            if self.config.get('use_structs', False) and self.struct_reader:
-                success = self.struct_reader.write_setpoint_value(symbol_name, value)
-            else:
-                success = self.ads_client.write_symbol(symbol_name, value)
-            
-            if success:
-                self.add_info_message(f'Skrev {value} til {symbol_name}')
-            else:
-                self.add_info_message(f'Fejl ved skrivning til {symbol_name}')
-        except Exception as e:
-            logger.error(f"Write error: {e}")
-            self.add_info_message(f'Fejl: {e}')
+        # STRUCT setpoints are written to their Value field; result is
+        # reported in on_write_done
+        if self.use_structs:
+            self.queue_write(f"{symbol_name}.Value", value)
+        else:
+            self.queue_write(symbol_name, value)
     
+    @pyqtSlot(str, int)
     def on_switch_changed(self, symbol_name: str, position: int):
         """Handle switch position change"""
         if not self.connected:
             return
         
-        try:
-            # Check if using STRUCT approach
-            if self.config.get('use_structs', False) and self.struct_reader:
-                success = self.struct_reader.write_switch_position(symbol_name, position)
-            else:
-                success = self.ads_client.write_symbol(symbol_name, position)
-            
+        # STRUCT switches are written to their Position field; result is
+        # reported in on_write_done
+        if self.use_structs:
+            self.queue_write(f"{symbol_name}.Position", position)
+        else:
+            self.queue_write(symbol_name, position)
+    
+    def queue_write(self, symbol_name: str, value):
+        """
+        Queue a write for the next sum write to the PLC
+        
+        A newer value for the same symbol replaces the queued one.
+        
+        Args:
+            symbol_name: Full symbol name
+            value: Value to write
+        """
+        self._pending_writes[symbol_name] = value
+        if not self._write_flush_timer.isActive():
+            self._write_flush_timer.start(self.WRITE_COALESCE_INTERVAL)
+    
+    @pyqtSlot()
+    def flush_writes(self):
+        """Send all queued writes to the ADS worker as one batch"""
+        if not self._pending_writes:
+            return
+        
+        values, self._pending_writes = self._pending_writes, {}
+        if not self.connected:
+            return
+        
+        self.write_requested.emit(values, self._write_batch_size)
+    
+    @pyqtSlot(str, object, bool)
+    def on_write_done(self, symbol_name: str, value, success: bool):
+        """Handle a write completed by the ADS worker"""
+        if self.use_structs:
+            # STRUCT writes go to <struct>.Value or <struct>.Position
+            struct_name, _, field = symbol_name.rpartition('.')
+            self.report_write(struct_name, value, success, is_switch=(field == 'Position'))
+            return
+        
+        symbol_config = self.symbol_parser.get_symbol_config(symbol_name)
+        is_switch = (symbol_config or {}).get('category') == 'switch'
+        self.report_write(symbol_name, value, success, is_switch)
+    
+    def report_write(self, symbol_name: str, value, success: bool, is_switch: bool):
+        """Show the result of a setpoint or switch write in the info panel"""
+        if is_switch:
             if success:
-                self.add_info_message(f'Skiftede {symbol_name} til position {position}')
-        except Exception as e:
-            logger.error(f"Write error: {e}")
+                self.add_info_message(f'Skiftede {symbol_name} til position {value}')
+        elif success:
+            self.add_info_message(f'Skrev {value} til {symbol_name}')
+        else:
+            self.add_info_message(f'Fejl ved skrivning til {symbol_name}')
     
     def on_alarm_change(self, alarms):
         """Handle alarm changes (callback from alarm manager)"""
         # Log new alarms
-        if self.config['alarms']['log_to_csv']:
+        if self._log_alarms_to_csv:
+            logged_ids = self._logged_alarm_ids
             for alarm in alarms:
-                if alarm.state.value == 'ACTIVE' and alarm not in self.alarm_logger:
+                if alarm.state.value == 'ACTIVE' and alarm.id not in logged_ids:
+                    logged_ids.add(alarm.id)
                     self.alarm_logger.log_alarm(alarm)
+            
+            # Forget alarms that are no longer active (cleared alarms get a new id)
+            logged_ids.intersection_update(alarm.id for alarm in alarms)
     
     def acknowledge_all_alarms(self):
         """Acknowledge all active alarms"""
@@ -995,9 +1289,13 @@ class TwinCATHMI(QMainWindow):
     
     def show_alarm_history(self):
         """Show alarm history window"""
+        # Imported on first use, not needed at startup
+        from alarm_history_window import AlarmHistoryWindow
+        
         history_window = AlarmHistoryWindow(self.alarm_manager, self.alarm_logger, self)
         history_window.exec_()
     
+    @pyqtSlot(str)
     def show_trend(self, symbol_name: str):
         """Show trend for symbol (placeholder)"""
         self.add_info_message(f'Trend for {symbol_name} (ikke implementeret endnu)')
@@ -1011,13 +1309,17 @@ class TwinCATHMI(QMainWindow):
     
     def scan_plc_symbols(self, silent: bool = False) -> bool:
         """
-        Scan PLC and auto-generate symbol configuration
+        Start a PLC scan that auto-generates the symbol configuration
+        
+        The scan runs on the ADS worker; the result is handled in
+        on_scan_finished.
         
         Args:
-            silent: If True, don't show message boxes
+            silent: If True, don't show message boxes and continue symbol
+                discovery with the new configuration when the scan is done
             
         Returns:
-            True if successful
+            True if the scan was started, False otherwise
         """
         if not self.connected or not self.ads_client:
             if not silent:
@@ -1025,40 +1327,55 @@ class TwinCATHMI(QMainWindow):
                                   'Du skal først forbinde til PLC\'en før scanning.')
             return False
         
-        try:
-            self.add_info_message('Scanner PLC for symboler...')
-            
-            # Create auto-config scanner
-            scanner = SymbolAutoConfig(self.ads_client)
-            
-            # Scan and generate config
-            success = scanner.scan_and_generate_config()
-            
-            if success:
-                self.add_info_message('PLC scan komplet - config opdateret!')
-                
-                if not silent:
-                    QMessageBox.information(
-                        self, 
-                        'Scan komplet',
-                        'PLC symboler er scannet og config.json er opdateret.\n\n'
-                        'Klik OK for at genindlæse symbolerne.'
-                    )
-                
-                return True
-            else:
-                self.add_info_message('PLC scan fejlede - se log')
-                if not silent:
-                    QMessageBox.warning(self, 'Scan fejlet', 
-                                      'Kunne ikke scanne PLC. Se log for detaljer.')
-                return False
-                
-        except Exception as e:
-            logger.error(f"PLC scan error: {e}", exc_info=True)
-            self.add_info_message(f'Scan fejl: {e}')
-            if not silent:
-                QMessageBox.critical(self, 'Scan fejl', f'Fejl under scanning:\n{e}')
+        if self._scan_running:
             return False
+        
+        self._scan_running = True
+        self._scan_silent = silent
+        self.scan_button.setEnabled(False)
+        self.add_info_message('Scanner PLC for symboler...')
+        self.statusBar().showMessage('Scanner PLC...')
+        self.scan_requested.emit(self._connection_generation)
+        return True
+    
+    @pyqtSlot(object, int)
+    def on_scan_finished(self, new_config, generation: int):
+        """Handle the result of a PLC scan run on the ADS worker"""
+        if generation != self._connection_generation:
+            # Scan started before a disconnect
+            return
+        
+        silent = self._scan_silent
+        self._scan_running = False
+        self.scan_button.setEnabled(True)
+        
+        if not self.connected:
+            return
+        
+        self.statusBar().showMessage('Forbundet')
+        
+        if new_config:
+            self.add_info_message('PLC scan komplet - config opdateret!')
+        else:
+            self.add_info_message('PLC scan fejlede - se log')
+        
+        if silent:
+            # Finish the discovery started in connect_to_plc
+            if new_config:
+                # Use the config the scan just wrote instead of re-reading it
+                self.config = new_config
+            self.discover_configured_symbols()
+            self.start_updates()
+        elif new_config:
+            QMessageBox.information(
+                self, 
+                'Scan komplet',
+                'PLC symboler er scannet og config.json er opdateret.\n\n'
+                'Klik OK for at genindlæse symbolerne.'
+            )
+        else:
+            QMessageBox.warning(self, 'Scan fejlet', 
+                              'Kunne ikke scanne PLC. Se log for detaljer.')
     
     def show_help(self):
         """Show help dialog"""
@@ -1096,23 +1413,31 @@ class TwinCATHMI(QMainWindow):
     
     def add_info_message(self, message: str):
         """Add message to info panel"""
-        from datetime import datetime
         timestamp = datetime.now().strftime('%H:%M:%S')
-        current_text = self.info_text.toPlainText()
+        line = f'[{timestamp}] {message}'
         
-        # Keep only last 4 lines
-        lines = current_text.split('\n')
-        if len(lines) >= 4:
-            lines = lines[-3:]
+        # Shown by flush_info_messages, so a burst of messages (discovery,
+        # repeated update errors) causes one repaint instead of one each
+        self._info_messages.append(line)
+        if not self._info_flush_timer.isActive():
+            self._info_flush_timer.start(self.INFO_FLUSH_INTERVAL)
+    
+    def flush_info_messages(self):
+        """Show the last info messages, whole, with a single text update"""
+        self.info_text.setPlainText('\n'.join(self._info_messages))
         
-        lines.append(f'[{timestamp}] {message}')
-        self.info_text.setText('\n'.join(lines))
+        # Keep the newest message in view
+        self.info_text.moveCursor(QTextCursor.End)
+        self.info_text.ensureCursorVisible()
     
     def closeEvent(self, event):
         """Handle window close"""
         if self.connected:
             self.disconnect_from_plc()
         
+        self._ads_thread.quit()
+        self._ads_thread.wait()
+        
         event.accept()
 
 
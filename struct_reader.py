@@ -2,23 +2,92 @@
 struct_reader.py - Læser TwinCAT STRUCTs via ADS
 """
 import pyads
-from typing import Dict, Any, List, Optional
+from pyads.errorcodes import ERROR_CODES
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# pyads sum reads report per-field failures as the ADS error text instead of a value
+_ADS_ERROR_TEXTS = frozenset(ERROR_CODES.values())
+
 
 class StructReader:
     """Read TwinCAT STRUCT data via ADS"""
     
-    def __init__(self, plc):
+    # STRUCT member fields: (keys in result dict, path suffix, is STRING).
+    # Non-string fields of a STRUCT are read with one ADS sum read.
+    ALARM_LIMIT_FIELDS = (
+        (('alarm_limits', 'high_high'), '.AlarmLimits.AlarmHighHigh', False),
+        (('alarm_limits', 'high'), '.AlarmLimits.AlarmHigh', False),
+        (('alarm_limits', 'low'), '.AlarmLimits.AlarmLow', False),
+        (('alarm_limits', 'low_low'), '.AlarmLimits.AlarmLowLow', False),
+        (('alarm_limits', 'priority'), '.AlarmLimits.AlarmPriority', False),
+        (('alarm_limits', 'active'), '.AlarmLimits.AlarmActive', False),
+        (('alarm_limits', 'warning'), '.AlarmLimits.WarningActive', False),
+        (('alarm_limits', 'text'), '.AlarmLimits.AlarmText', True),
+        (('alarm_limits', 'hysteresis'), '.AlarmLimits.Hysteresis', False),
+    )
+    
+    DISPLAY_FIELDS = (
+        (('display', 'name'), '.Display.DisplayName', True),
+        (('display', 'description'), '.Display.Description', True),
+        (('display', 'visible'), '.Display.Visible', False),
+        (('display', 'readonly'), '.Display.ReadOnly', False),
+    )
+    
+    SETPOINT_FIELDS = (
+        (('value',), '.Value', False),
+        (('config', 'unit'), '.Config.Unit', True),
+        (('config', 'min'), '.Config.nMin', False),
+        (('config', 'max'), '.Config.nMax', False),
+        (('config', 'decimals'), '.Config.Decimals', False),
+        (('config', 'step'), '.Config.Step', False),
+    ) + ALARM_LIMIT_FIELDS + DISPLAY_FIELDS
+    
+    PROCESS_VALUE_FIELDS = SETPOINT_FIELDS + (
+        (('quality',), '.Quality', False),
+        (('sensor_fault',), '.SensorFault', False),
+    )
+    
+    # Position labels (.Config.Pos<n>_Label) are read once NumPositions is known
+    SWITCH_FIELDS = (
+        (('position',), '.Position', False),
+        (('config', 'num_positions'), '.Config.NumPositions', False),
+    ) + DISPLAY_FIELDS
+    
+    ALARM_FIELDS = (
+        (('active',), '.Active', False),
+        (('text',), '.AlarmText', True),
+        (('priority',), '.AlarmPriority', False),
+        (('acknowledged',), '.Acknowledged', False),
+        (('trigger_count',), '.TriggerCount', False),
+        (('display', 'name'), '.Display.DisplayName', True),
+        (('display', 'description'), '.Display.Description', True),
+        (('display', 'visible'), '.Display.Visible', False),
+    )
+    
+    MAX_SWITCH_POSITIONS = 8
+    
+    # Symbol type -> (list key in symbols config, field table); read_<type>
+    # reads a single STRUCT of the type
+    STRUCT_TYPES = {
+        'setpoint': ('setpoints', SETPOINT_FIELDS),
+        'process_value': ('process_values', PROCESS_VALUE_FIELDS),
+        'switch': ('switches', SWITCH_FIELDS),
+        'alarm': ('alarms', ALARM_FIELDS),
+    }
+    
+    def __init__(self, ads_client):
         """
         Initialize STRUCT reader
         
         Args:
-            plc: pyads.Connection object
+            ads_client: Connected ADSClient; its PLC variable handle cache is
+                shared and released when the client disconnects
         """
-        self.plc = plc
+        self.ads_client = ads_client
+        self.plc = ads_client.plc
     
     def _read_string(self, path: str) -> str:
         """
@@ -31,20 +100,116 @@ class StructReader:
             Decoded string value
         """
         try:
-            return self.plc.read_by_name(path, pyads.PLCTYPE_STRING)
+            handle = self.ads_client.get_handle(path)
+            return self.plc.read_by_name(path, pyads.PLCTYPE_STRING, handle=handle)
         except UnicodeDecodeError:
             # TwinCAT uses Windows-1252 encoding for special characters
             try:
-                raw_bytes = self.plc.read(self.plc.get_handle(path), pyads.PLCTYPE_STRING)
-                if isinstance(raw_bytes, bytes):
-                    # Decode with windows-1252 and remove null terminator
-                    return raw_bytes.split(b'\x00')[0].decode('windows-1252', errors='replace')
-                return str(raw_bytes)
-            except:
+                raw = self.plc.read_by_name(path, pyads.PLCTYPE_STRING,
+                                            return_ctypes=True, handle=handle)
+                # Decode with windows-1252 and remove null terminator
+                return bytes(raw).split(b'\x00')[0].decode('windows-1252', errors='replace')
+            except Exception:
                 return ""
-        except:
+        except Exception:
+            self.ads_client.drop_handle(path)
             return ""
     
+    def _read_values(self, paths: List[str]) -> Dict[str, Any]:
+        """
+        Read non-string fields with one ADS sum read
+        
+        Args:
+            paths: Full symbol paths
+            
+        Returns:
+            Dict mapping path to value
+            
+        Raises:
+            RuntimeError: If the PLC reports an error for any of the fields
+        """
+        if not paths:
+            return {}
+        
+        values = self.plc.read_list_by_name(paths)
+        
+        # A failed field comes back as its ADS error text
+        errors = [f"{path}: {value}" for path, value in values.items() if isinstance(value, str)]
+        if errors:
+            raise RuntimeError(', '.join(errors))
+        return values
+    
+    def _read_strings(self, paths: List[str]) -> Dict[str, str]:
+        """
+        Read STRING fields, with one ADS sum read when possible
+        
+        pyads decodes sum-read strings as UTF-8, so texts with Windows-1252
+        characters (æ, ø, å, °) make the sum read fail; those are then read
+        one by one with _read_string. Fields the sum read reports an ADS
+        error for are re-read the same way.
+        
+        Args:
+            paths: Full symbol paths
+            
+        Returns:
+            Dict mapping path to string ("" if it couldn't be read)
+        """
+        if not paths:
+            return {}
+        
+        try:
+            values = self.plc.read_list_by_name(paths)
+        except Exception:
+            return {path: self._read_string(path) for path in paths}
+        
+        for path, value in values.items():
+            if value in _ADS_ERROR_TEXTS:
+                values[path] = self._read_string(path)
+        return values
+    
+    @staticmethod
+    def _field_paths(symbol_path: str, fields: tuple) -> Tuple[List[str], List[str]]:
+        """Full paths of a STRUCT's non-string and STRING fields"""
+        numeric = [f"{symbol_path}{suffix}" for _, suffix, is_string in fields if not is_string]
+        strings = [f"{symbol_path}{suffix}" for _, suffix, is_string in fields if is_string]
+        return numeric, strings
+    
+    def _switch_label_paths(self, symbol_path: str, num_positions: int) -> List[str]:
+        """Full paths of a switch's position labels"""
+        return [
+            f"{symbol_path}.Config.Pos{i}_Label"
+            for i in range(min(num_positions, self.MAX_SWITCH_POSITIONS))
+        ]
+    
+    @staticmethod
+    def _assemble(symbol_path: str, fields: tuple, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the nested result dict of one STRUCT from values read by path"""
+        result: Dict[str, Any] = {}
+        for keys, suffix, _ in fields:
+            target = result
+            for key in keys[:-1]:
+                target = target.setdefault(key, {})
+            target[keys[-1]] = values[f"{symbol_path}{suffix}"]
+        return result
+    
+    def _read_struct(self, symbol_path: str, fields: tuple) -> Dict[str, Any]:
+        """
+        Read the given fields of one STRUCT into a nested dict
+        
+        Args:
+            symbol_path: Full symbol path of the STRUCT
+            fields: Field table, e.g. SETPOINT_FIELDS
+            
+        Returns:
+            Dict shaped by the field keys, e.g. {'value': .., 'config': {..}}
+        """
+        numeric, strings = self._field_paths(symbol_path, fields)
+        
+        values = self._read_values(numeric)
+        values.update(self._read_strings(strings))
+        
+        return self._assemble(symbol_path, fields, values)
+    
     def read_setpoint(self, symbol_path: str) -> Optional[Dict[str, Any]]:
         """
         Read ST_HMI_Setpoint STRUCT
@@ -56,33 +221,7 @@ class StructReader:
             Dict with value and all config fields
         """
         try:
-            result = {
-                'value': self.plc.read_by_name(f"{symbol_path}.Value", pyads.PLCTYPE_REAL),
-                'config': {
-                    'unit': self._read_string(f"{symbol_path}.Config.Unit"),
-                    'min': self.plc.read_by_name(f"{symbol_path}.Config.nMin", pyads.PLCTYPE_REAL),
-                    'max': self.plc.read_by_name(f"{symbol_path}.Config.nMax", pyads.PLCTYPE_REAL),
-                    'decimals': self.plc.read_by_name(f"{symbol_path}.Config.Decimals", pyads.PLCTYPE_USINT),
-                    'step': self.plc.read_by_name(f"{symbol_path}.Config.Step", pyads.PLCTYPE_REAL),
-                },
-                'alarm_limits': {
-                    'high_high': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.AlarmHighHigh", pyads.PLCTYPE_REAL),
-                    'high': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.AlarmHigh", pyads.PLCTYPE_REAL),
-                    'low': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.AlarmLow", pyads.PLCTYPE_REAL),
-                    'low_low': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.AlarmLowLow", pyads.PLCTYPE_REAL),
-                    'priority': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.AlarmPriority", pyads.PLCTYPE_USINT),
-                    'active': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.AlarmActive", pyads.PLCTYPE_BOOL),
-                    'warning': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.WarningActive", pyads.PLCTYPE_BOOL),
-                    'text': self._read_string(f"{symbol_path}.AlarmLimits.AlarmText"),
-                    'hysteresis': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.Hysteresis", pyads.PLCTYPE_REAL),
-                },
-                'display': {
-                    'name': self._read_string(f"{symbol_path}.Display.DisplayName"),
-                    'description': self._read_string(f"{symbol_path}.Display.Description"),
-                    'visible': self.plc.read_by_name(f"{symbol_path}.Display.Visible", pyads.PLCTYPE_BOOL),
-                    'readonly': self.plc.read_by_name(f"{symbol_path}.Display.ReadOnly", pyads.PLCTYPE_BOOL),
-                }
-            }
+            result = self._read_struct(symbol_path, self.SETPOINT_FIELDS)
             
             logger.debug(f"Read setpoint {symbol_path}: {result['value']} {result['config']['unit']}")
             return result
@@ -102,35 +241,7 @@ class StructReader:
             Dict with value and config fields
         """
         try:
-            result = {
-                'value': self.plc.read_by_name(f"{symbol_path}.Value", pyads.PLCTYPE_REAL),
-                'config': {
-                    'unit': self._read_string(f"{symbol_path}.Config.Unit"),
-                    'decimals': self.plc.read_by_name(f"{symbol_path}.Config.Decimals", pyads.PLCTYPE_USINT),
-                    'min': self.plc.read_by_name(f"{symbol_path}.Config.nMin", pyads.PLCTYPE_REAL),
-                    'max': self.plc.read_by_name(f"{symbol_path}.Config.nMax", pyads.PLCTYPE_REAL),
-                    'step': self.plc.read_by_name(f"{symbol_path}.Config.Step", pyads.PLCTYPE_REAL),
-                },
-                'alarm_limits': {
-                    'high_high': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.AlarmHighHigh", pyads.PLCTYPE_REAL),
-                    'high': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.AlarmHigh", pyads.PLCTYPE_REAL),
-                    'low': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.AlarmLow", pyads.PLCTYPE_REAL),
-                    'low_low': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.AlarmLowLow", pyads.PLCTYPE_REAL),
-                    'priority': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.AlarmPriority", pyads.PLCTYPE_USINT),
-                    'active': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.AlarmActive", pyads.PLCTYPE_BOOL),
-                    'warning': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.WarningActive", pyads.PLCTYPE_BOOL),
-                    'text': self._read_string(f"{symbol_path}.AlarmLimits.AlarmText"),
-                    'hysteresis': self.plc.read_by_name(f"{symbol_path}.AlarmLimits.Hysteresis", pyads.PLCTYPE_REAL),
-                },
-                'display': {
-                    'name': self._read_string(f"{symbol_path}.Display.DisplayName"),
-                    'description': self._read_string(f"{symbol_path}.Display.Description"),
-                    'visible': self.plc.read_by_name(f"{symbol_path}.Display.Visible", pyads.PLCTYPE_BOOL),
-                    'readonly': self.plc.read_by_name(f"{symbol_path}.Display.ReadOnly", pyads.PLCTYPE_BOOL),
-                },
-                'quality': self.plc.read_by_name(f"{symbol_path}.Quality", pyads.PLCTYPE_USINT),
-                'sensor_fault': self.plc.read_by_name(f"{symbol_path}.SensorFault", pyads.PLCTYPE_BOOL),
-            }
+            result = self._read_struct(symbol_path, self.PROCESS_VALUE_FIELDS)
             
             logger.debug(f"Read process value {symbol_path}: {result['value']} {result['config']['unit']}")
             return result
@@ -150,30 +261,14 @@ class StructReader:
             Dict with position and labels
         """
         try:
-            num_pos = self.plc.read_by_name(f"{symbol_path}.Config.NumPositions", pyads.PLCTYPE_USINT)
+            result = self._read_struct(symbol_path, self.SWITCH_FIELDS)
+            num_pos = result['config']['num_positions']
             
             # Læs labels for alle positioner
-            labels = []
-            for i in range(min(num_pos, 8)):  # Max 8 positions
-                try:
-                    label = self._read_string(f"{symbol_path}.Config.Pos{i}_Label")
-                    labels.append(label)
-                except:
-                    labels.append(f"Pos {i}")
-            
-            result = {
-                'position': self.plc.read_by_name(f"{symbol_path}.Position", pyads.PLCTYPE_INT),
-                'config': {
-                    'num_positions': num_pos,
-                    'labels': labels,
-                },
-                'display': {
-                    'name': self._read_string(f"{symbol_path}.Display.DisplayName"),
-                    'description': self._read_string(f"{symbol_path}.Display.Description"),
-                    'visible': self.plc.read_by_name(f"{symbol_path}.Display.Visible", pyads.PLCTYPE_BOOL),
-                    'readonly': self.plc.read_by_name(f"{symbol_path}.Display.ReadOnly", pyads.PLCTYPE_BOOL),
-                },
-            }
+            label_paths = self._switch_label_paths(symbol_path, num_pos)
+            label_values = self._read_strings(label_paths)
+            labels = [label_values[path] for path in label_paths]
+            result['config']['labels'] = labels
             
             logger.debug(f"Read switch {symbol_path}: pos={result['position']}, labels={labels}")
             return result
@@ -193,18 +288,7 @@ class StructReader:
             Dict with alarm status
         """
         try:
-            result = {
-                'active': self.plc.read_by_name(f"{symbol_path}.Active", pyads.PLCTYPE_BOOL),
-                'text': self._read_string(f"{symbol_path}.AlarmText"),
-                'priority': self.plc.read_by_name(f"{symbol_path}.AlarmPriority", pyads.PLCTYPE_USINT),
-                'acknowledged': self.plc.read_by_name(f"{symbol_path}.Acknowledged", pyads.PLCTYPE_BOOL),
-                'trigger_count': self.plc.read_by_name(f"{symbol_path}.TriggerCount", pyads.PLCTYPE_UDINT),
-                'display': {
-                    'name': self._read_string(f"{symbol_path}.Display.DisplayName"),
-                    'description': self._read_string(f"{symbol_path}.Display.Description"),
-                    'visible': self.plc.read_by_name(f"{symbol_path}.Display.Visible", pyads.PLCTYPE_BOOL),
-                },
-            }
+            result = self._read_struct(symbol_path, self.ALARM_FIELDS)
             
             logger.debug(f"Read alarm {symbol_path}: active={result['active']}")
             return result
@@ -225,11 +309,13 @@ class StructReader:
             True if successful
         """
         try:
-            self.plc.write_by_name(f"{symbol_path}.Value", value, pyads.PLCTYPE_REAL)
+            path = f"{symbol_path}.Value"
+            self.plc.write_by_name(path, value, pyads.PLCTYPE_REAL, handle=self.ads_client.get_handle(path))
             logger.info(f"Wrote setpoint {symbol_path}.Value = {value}")
             return True
         except Exception as e:
             logger.error(f"Error writing setpoint {symbol_path}: {e}")
+            self.ads_client.drop_handle(f"{symbol_path}.Value")
             return False
     
     def write_switch_position(self, symbol_path: str, position: int) -> bool:
@@ -244,11 +330,13 @@ class StructReader:
             True if successful
         """
         try:
-            self.plc.write_by_name(f"{symbol_path}.Position", position, pyads.PLCTYPE_INT)
+            path = f"{symbol_path}.Position"
+            self.plc.write_by_name(path, position, pyads.PLCTYPE_INT, handle=self.ads_client.get_handle(path))
             logger.info(f"Wrote switch {symbol_path}.Position = {position}")
             return True
         except Exception as e:
             logger.error(f"Error writing switch {symbol_path}: {e}")
+            self.ads_client.drop_handle(f"{symbol_path}.Position")
             return False
     
     def acknowledge_alarm(self, symbol_path: str) -> bool:
@@ -262,13 +350,61 @@ class StructReader:
             True if successful
         """
         try:
-            self.plc.write_by_name(f"{symbol_path}.Acknowledged", True, pyads.PLCTYPE_BOOL)
+            path = f"{symbol_path}.Acknowledged"
+            self.plc.write_by_name(path, True, pyads.PLCTYPE_BOOL, handle=self.ads_client.get_handle(path))
             logger.info(f"Acknowledged alarm {symbol_path}")
             return True
         except Exception as e:
             logger.error(f"Error acknowledging alarm {symbol_path}: {e}")
+            self.ads_client.drop_handle(f"{symbol_path}.Acknowledged")
             return False
     
+    def _read_structs(self, structs: List[Tuple[str, str, str]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Read many STRUCTs with one sum read for all non-string fields
+        
+        STRING fields (including switch labels) follow in a second sum read.
+        
+        Args:
+            structs: (name, full path, symbol type) tuples
+            
+        Returns:
+            Dict mapping symbol names to path, type and data
+            
+        Raises:
+            Exception: If any non-string field can't be read
+        """
+        numeric: List[str] = []
+        strings: List[str] = []
+        for _, full_path, sym_type in structs:
+            struct_numeric, struct_strings = self._field_paths(full_path, self.STRUCT_TYPES[sym_type][1])
+            numeric += struct_numeric
+            strings += struct_strings
+        
+        values = self._read_values(numeric)
+        
+        # Switch labels depend on NumPositions from the first read
+        label_paths = {}
+        for _, full_path, sym_type in structs:
+            if sym_type == 'switch':
+                num_pos = values[f"{full_path}.Config.NumPositions"]
+                label_paths[full_path] = self._switch_label_paths(full_path, num_pos)
+                strings += label_paths[full_path]
+        
+        values.update(self._read_strings(strings))
+        
+        all_symbols = {}
+        for name, full_path, sym_type in structs:
+            data = self._assemble(full_path, self.STRUCT_TYPES[sym_type][1], values)
+            if sym_type == 'switch':
+                data['config']['labels'] = [values[path] for path in label_paths[full_path]]
+            all_symbols[name] = {
+                'path': full_path,
+                'type': sym_type,
+                'data': data
+            }
+        return all_symbols
+    
     def read_all_symbols(self, symbols_config: Dict[str, List[str]], base_path: str = "MAIN.HMI") -> Dict[str, Dict[str, Any]]:
         """
         Read all symbols from config
@@ -280,51 +416,27 @@ class StructReader:
         Returns:
             Dict mapping symbol names to their data
         """
-        all_symbols = {}
-        
-        # Read setpoints
-        for sp_name in symbols_config.get('setpoints', []):
-            full_path = f"{base_path}.{sp_name}"
-            sp_data = self.read_setpoint(full_path)
-            if sp_data:
-                all_symbols[sp_name] = {
-                    'path': full_path,
-                    'type': 'setpoint',
-                    'data': sp_data
-                }
+        # (name, full path, symbol type) of every configured STRUCT
+        structs = [
+            (name, f"{base_path}.{name}", sym_type)
+            for sym_type, (config_key, _) in self.STRUCT_TYPES.items()
+            for name in symbols_config.get(config_key, [])
+        ]
         
-        # Read process values
-        for pv_name in symbols_config.get('process_values', []):
-            full_path = f"{base_path}.{pv_name}"
-            pv_data = self.read_process_value(full_path)
-            if pv_data:
-                all_symbols[pv_name] = {
-                    'path': full_path,
-                    'type': 'process_value',
-                    'data': pv_data
-                }
-        
-        # Read switches
-        for sw_name in symbols_config.get('switches', []):
-            full_path = f"{base_path}.{sw_name}"
-            sw_data = self.read_switch(full_path)
-            if sw_data:
-                all_symbols[sw_name] = {
-                    'path': full_path,
-                    'type': 'switch',
-                    'data': sw_data
-                }
-        
-        # Read alarms
-        for al_name in symbols_config.get('alarms', []):
-            full_path = f"{base_path}.{al_name}"
-            al_data = self.read_alarm(full_path)
-            if al_data:
-                all_symbols[al_name] = {
-                    'path': full_path,
-                    'type': 'alarm',
-                    'data': al_data
-                }
+        try:
+            all_symbols = self._read_structs(structs)
+        except Exception as e:
+            # E.g. a configured STRUCT doesn't exist; read them one by one and skip failures
+            logger.warning(f"Batched STRUCT read failed, reading STRUCTs one by one: {e}")
+            all_symbols = {}
+            for name, full_path, sym_type in structs:
+                data = getattr(self, f'read_{sym_type}')(full_path)
+                if data:
+                    all_symbols[name] = {
+                        'path': full_path,
+                        'type': sym_type,
+                        'data': data
+                    }
         
         logger.info(f"Read {len(all_symbols)} symbols from PLC")
         return all_symbols
@@ -10,7 +10,11 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
-logging.basicConfig(level=logging.DEBUG)
+try:
+    import orjson  # Optional, faster config reads/writes
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,7 +38,7 @@ class SymbolAutoConfig:
     def __init__(self, ads_client):
         self.ads_client = ads_client
     
-    def scan_and_generate_config(self, config_file: str = 'config.json') -> bool:
+    def scan_and_generate_config(self, config_file: str = 'config.json') -> Optional[Dict[str, Any]]:
         """
         Scan PLC and generate/update config.json
         
@@ -42,7 +46,7 @@ class SymbolAutoConfig:
             config_file: Path to config file
             
         Returns:
-            True if successful
+            The updated configuration if successful, None otherwise
         """
         try:
             logger.info("Starting automatic symbol scan...")
@@ -67,12 +71,12 @@ class SymbolAutoConfig:
             # Load existing config
             config_path = Path(config_file)
             if config_path.exists():
-                # Backup existing config
+                config_bytes = config_path.read_bytes()
+                existing_config = orjson.loads(config_bytes) if orjson else json.loads(config_bytes)
+                
+                # Backup existing config (byte-for-byte copy)
                 backup_path = config_path.with_suffix('.json.backup')
-                with open(config_path, 'r') as f:
-                    existing_config = json.load(f)
-                with open(backup_path, 'w') as f:
-                    json.dump(existing_config, f, indent=2)
+                backup_path.write_bytes(config_bytes)
                 logger.info(f"Backed up existing config to {backup_path}")
             else:
                 existing_config = self._get_default_config()
@@ -86,15 +90,19 @@ class SymbolAutoConfig:
             }
             
             # Save updated config
-            with open(config_path, 'w') as f:
-                json.dump(existing_config, f, indent=2)
+            if orjson:
+                config_bytes = orjson.dumps(existing_config, option=orjson.OPT_INDENT_2)
+            else:
+                # Same bytes as orjson: UTF-8 text, not \u escapes
+                config_bytes = json.dumps(existing_config, indent=2, ensure_ascii=False).encode('utf-8')
+            config_path.write_bytes(config_bytes)
             
             logger.info(f"Config saved to {config_path}")
-            return True
+            return existing_config
             
         except Exception as e:
             logger.error(f"Failed to scan and generate config: {e}", exc_info=True)
-            return False
+            return None
     
     def _analyze_symbol(self, symbol) -> Optional[Dict[str, Any]]:
         """
@@ -108,8 +116,8 @@ class SymbolAutoConfig:
         """
         try:
             symbol_name = symbol.name
-            data_type = str(symbol.plc_type) if hasattr(symbol, 'plc_type') else ''
-            comment = symbol.comment if hasattr(symbol, 'comment') and symbol.comment else ''
+            data_type = str(getattr(symbol, 'plc_type', ''))
+            comment = getattr(symbol, 'comment', None) or ''
             
             # Skip version info and system symbols
             if any(skip in symbol_name.lower() for skip in ['version', 'system', 'constant']):
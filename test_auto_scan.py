@@ -4,9 +4,12 @@ Test automatic symbol scanning
 
 import sys
 import json
+import logging
 from ads_client import ADSClient
 from symbol_auto_config import SymbolAutoConfig
 
+logging.basicConfig(level=logging.DEBUG)
+
 # Fix Windows console encoding
 if sys.platform == 'win32':
     import codecs
@@ -5,6 +5,7 @@ Run this to verify the STRUCT implementation works
 
 import pyads
 import json
+from ads_client import ADSClient
 from struct_reader import StructReader
 
 def test_struct_connection():
@@ -16,7 +17,7 @@ def test_struct_connection():
     
     # Load config
     try:
-        with open('config.json', 'r') as f:
+        with open('config.json', 'r', encoding='utf-8') as f:
             config = json.load(f)
         print("✓ Config loaded")
     except Exception as e:
@@ -36,8 +37,10 @@ def test_struct_connection():
     # Connect to PLC
     print("Connecting to PLC...")
     try:
-        plc = pyads.Connection(ams_net_id, ams_port)
-        plc.open()
+        ads_client = ADSClient(ams_net_id, ams_port)
+        if not ads_client.connect():
+            raise Exception('Connection failed')
+        plc = ads_client.plc
         print("✓ Connected to PLC")
     except Exception as e:
         print(f"✗ Connection failed: {e}")
@@ -45,7 +48,7 @@ def test_struct_connection():
     
     try:
         # Initialize StructReader
-        reader = StructReader(plc)
+        reader = StructReader(ads_client)
         print("✓ StructReader initialized")
         print()
         
@@ -190,7 +193,7 @@ def test_struct_connection():
         
     finally:
         # Close connection
-        plc.close()
+        ads_client.disconnect()
         print("Connection closed")
 
 
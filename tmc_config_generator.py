@@ -3,6 +3,7 @@ TMC-based Configuration Generator
 Generates complete HMI configuration from TMC file with all attributes
 """
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Any
 from tmc_parser import TMCParser
@@ -11,6 +12,15 @@ from tmc_parser import TMCParser
 class TMCConfigGenerator:
     """Generate HMI config from TMC file"""
     
+    # HMI marker attribute -> (symbols category, builder method).
+    # Order matters: a symbol goes into the first category it matches.
+    CATEGORY_DISPATCH = (
+        ('HMI_SP', 'setpoints', '_create_setpoint_config'),
+        ('HMI_PV', 'process_values', '_create_process_value_config'),
+        ('HMI_SWITCH', 'switches', '_create_switch_config'),
+        ('HMI_ALARM', 'alarms', '_create_alarm_config'),
+    )
+    
     def __init__(self, tmc_file_path: str):
         """Initialize with TMC file path"""
         self.parser = TMCParser(tmc_file_path)
@@ -59,26 +69,20 @@ class TMCConfigGenerator:
             }
         }
         
+        # Resolve target lists and builders once, not per symbol
+        dispatch = [
+            (marker, config['symbols'][category], getattr(self, builder))
+            for marker, category, builder in self.CATEGORY_DISPATCH
+        ]
+        
         # Process each HMI symbol
         for symbol in self.hmi_symbols:
             attrs = symbol['attributes']
             
-            if 'HMI_SP' in attrs:
-                config['symbols']['setpoints'].append(
-                    self._create_setpoint_config(symbol)
-                )
-            elif 'HMI_PV' in attrs:
-                config['symbols']['process_values'].append(
-                    self._create_process_value_config(symbol)
-                )
-            elif 'HMI_SWITCH' in attrs:
-                config['symbols']['switches'].append(
-                    self._create_switch_config(symbol)
-                )
-            elif 'HMI_ALARM' in attrs:
-                config['symbols']['alarms'].append(
-                    self._create_alarm_config(symbol)
-                )
+            for marker, bucket, build in dispatch:
+                if marker in attrs:
+                    bucket.append(build(symbol))
+                    break
         
         return config
     
@@ -255,6 +259,32 @@ class TMCConfigGenerator:
         print("\n" + "=" * 80)
 
 
+# Every rebuild of the TMC file adds a new (path, mtime_ns) key; keeping the
+# current and the previous version is enough for reconnects and rescans
+@lru_cache(maxsize=2)
+def _generate_config(tmc_file_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Generate config for one version of a TMC file (mtime_ns is the cache key)"""
+    return TMCConfigGenerator(tmc_file_path).generate_config()
+
+
+def generate_config_cached(tmc_file_path: str) -> Dict[str, Any]:
+    """
+    Generate configuration from TMC file, reusing the result while the file is unchanged
+    
+    TMCParser's disk cache saves the XML parse; this also saves reading that
+    cache and building the config on every reconnect and rescan. The returned
+    dictionary is shared between calls and must not be modified.
+    
+    Args:
+        tmc_file_path: Path to TMC file
+        
+    Returns:
+        Configuration dictionary as returned by TMCConfigGenerator.generate_config
+    """
+    mtime_ns = Path(tmc_file_path).stat().st_mtime_ns
+    return _generate_config(tmc_file_path, mtime_ns)
+
+
 def main():
     """Generate configuration from TMC file"""
     import sys
@@ -2,14 +2,29 @@
 TMC File Parser - Reads TwinCAT metadata directly from .tmc XML file
 Requires access to TwinCAT project folder
 """
+import json
+import logging
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+try:
+    import orjson  # Optional, faster cache reads/writes
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
 
 
 class TMCParser:
     """Parse TwinCAT TMC (Type Management Component) XML files"""
     
+    # Attribute name prefixes that mark a symbol as relevant for the HMI
+    HMI_ATTRIBUTE_PREFIXES = ('HMI_', 'Unit', 'Min', 'Max', 'Decimals', 'Pos', 'Alarm', 'Step')
+    
+    # Bump when the layout of parsed symbol dicts changes to invalidate old caches
+    CACHE_SCHEMA_VERSION = 1
+    
     def __init__(self, tmc_file_path: str):
         """
         Initialize TMC parser
@@ -21,9 +36,78 @@ class TMCParser:
         if not self.tmc_path.exists():
             raise FileNotFoundError(f"TMC file not found: {tmc_file_path}")
         
-        self.tree = ET.parse(self.tmc_path)
-        self.root = self.tree.getroot()
+        # Sibling cache file with the parsed HMI symbols (e.g. MyProject.tmc.cache)
+        self.cache_path = self.tmc_path.with_name(self.tmc_path.name + '.cache')
+        
+        # XML is only parsed when the cache can't be used
+        self._tree = None
+        self._tree_key = None  # Cache key of the TMC file as it was when parsed
+        
+        # Parsed results are cached - the XML tree never changes after load
+        self._all_symbols = None
+        self._hmi_symbols = None
+        
+    @property
+    def tree(self) -> ET.ElementTree:
+        """Parsed XML tree (loaded on first access)"""
+        if self._tree is None:
+            # Key taken before parsing: if TwinCAT rewrites the file meanwhile,
+            # the cache won't match the new file and is rebuilt next time
+            self._tree_key = self._cache_key()
+            self._tree = ET.parse(self.tmc_path)
+        return self._tree
+    
+    @property
+    def root(self) -> ET.Element:
+        """Root element of the TMC XML"""
+        return self.tree.getroot()
+    
+    def _cache_key(self) -> str:
+        """Cache key based on TMC file modification time and size"""
+        stat = self.tmc_path.stat()
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+    
+    def _load_cache(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load cached HMI symbols if the cache matches the current TMC file
         
+        Returns:
+            List of HMI symbols, or None if there is no valid cache
+        """
+        try:
+            data = self.cache_path.read_bytes()
+            cache = orjson.loads(data) if orjson else json.loads(data)
+        except (OSError, ValueError):
+            return None
+        
+        if cache.get('schema') != self.CACHE_SCHEMA_VERSION or cache.get('key') != self._cache_key():
+            return None
+        
+        logger.debug(f"Using cached TMC symbols from {self.cache_path}")
+        return cache.get('hmi_symbols')
+    
+    def _save_cache(self, hmi_symbols: List[Dict[str, Any]], key: str):
+        """
+        Write HMI symbols to the cache file (atomically, failures are ignored)
+        
+        Args:
+            hmi_symbols: HMI symbols parsed from the TMC file
+            key: Cache key of the TMC file the symbols were parsed from
+        """
+        cache = {
+            'schema': self.CACHE_SCHEMA_VERSION,
+            'key': key,
+            'hmi_symbols': hmi_symbols
+        }
+        data = orjson.dumps(cache) if orjson else json.dumps(cache).encode('utf-8')
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        try:
+            tmp_path.write_bytes(data)
+            tmp_path.replace(self.cache_path)
+        except OSError as e:
+            # Read-only project folder or network share - just parse next time
+            logger.debug(f"Could not write TMC cache {self.cache_path}: {e}")
+    
     def get_all_symbols(self) -> List[Dict[str, Any]]:
         """
         Extract all symbols with their attributes from TMC file
@@ -31,15 +115,18 @@ class TMCParser:
         Returns:
             List of symbol dictionaries with name, type, attributes, etc.
         """
-        symbols = []
-        
-        # TMC structure: TcModuleClass -> Modules -> Module -> DataAreas -> DataArea -> Symbol
-        for symbol_elem in self.root.findall(".//Symbol"):
-            symbol_info = self._parse_symbol(symbol_elem)
-            if symbol_info:
-                symbols.append(symbol_info)
+        if self._all_symbols is None:
+            symbols = []
+            
+            # TMC structure: TcModuleClass -> Modules -> Module -> DataAreas -> DataArea -> Symbol
+            for symbol_elem in self.root.findall(".//Symbol"):
+                symbol_info = self._parse_symbol(symbol_elem)
+                if symbol_info:
+                    symbols.append(symbol_info)
+            
+            self._all_symbols = symbols
         
-        return symbols
+        return self._all_symbols
     
     def _parse_symbol(self, symbol_elem) -> Dict[str, Any]:
         """Parse a single Symbol element from TMC DataArea"""
@@ -187,21 +274,41 @@ class TMCParser:
         Returns:
             List of HMI symbols with their complete attribute sets
         """
-        all_symbols = self.get_all_symbols()
-        hmi_symbols = []
+        if self._hmi_symbols is not None:
+            return self._hmi_symbols
         
-        for symbol in all_symbols:
-            # Check if symbol has HMI attributes
-            has_hmi = any(
-                key.startswith(('HMI_', 'Unit', 'Min', 'Max', 'Decimals', 'Pos', 'Alarm', 'Step'))
-                for key in symbol['attributes'].keys()
-            )
-            
-            if has_hmi:
-                hmi_symbols.append(symbol)
+        cached = self._load_cache()
+        if cached is not None:
+            self._hmi_symbols = cached
+            return cached
         
+        hmi_symbols = []
+        
+        if self._all_symbols is not None:
+            # Everything is parsed already - just filter
+            for symbol in self._all_symbols:
+                if any(key.startswith(self.HMI_ATTRIBUTE_PREFIXES) for key in symbol['attributes']):
+                    hmi_symbols.append(symbol)
+        else:
+            # Only fully parse symbols whose property names can make them HMI symbols
+            for symbol_elem in self.root.findall(".//Symbol"):
+                if not self._has_hmi_property(symbol_elem):
+                    continue
+                symbol_info = self._parse_symbol(symbol_elem)
+                if symbol_info:
+                    hmi_symbols.append(symbol_info)
+        
+        self._hmi_symbols = hmi_symbols
+        self._save_cache(hmi_symbols, self._tree_key)
         return hmi_symbols
     
+    def _has_hmi_property(self, symbol_elem) -> bool:
+        """Cheap pre-check on property names before parsing a Symbol element"""
+        for name_elem in symbol_elem.iterfind("Properties/Property/Name"):
+            if name_elem.text and name_elem.text.startswith(self.HMI_ATTRIBUTE_PREFIXES):
+                return True
+        return False
+    
     def print_symbol_details(self, symbol: Dict[str, Any], indent: int = 0):
         """Pretty print symbol information"""
         prefix = "  " * indent